@@ -0,0 +1,244 @@
+"""
+In-process load benchmark for the HTTP API.
+
+Drives ``main.app`` over httpx's ASGI transport at a fixed concurrency. The ports
+are backed by local stand-ins, so no MySQL or Redis is needed: the MySQL
+repositories run against SQLite through the aiosqlite dialect, and the cache is
+an in-memory CacheRepository behind the usual L1 tier.
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.api_benchmark                    # compare with benchmarks/baseline.json
+    python -m benchmarks.api_benchmark --update-baseline  # record a new baseline
+
+The report is printed as JSON. Baselines are only comparable on the machine that
+recorded them. The run exits with status 1 when any endpoint's
+throughput or p95 latency is worse than the baseline by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.stand_ins import InMemoryCacheRepository, SQLiteProductRepository
+from main import app
+from src.application.services import ProductServiceImpl, UserServiceImpl
+from src.domain.ports.repositories import CacheRepository
+from src.infrastructure import database
+from src.infrastructure.cache import cache_codec, local_cache
+from src.infrastructure.config import settings
+from src.infrastructure.metrics import metrics_recorder
+from src.infrastructure.models import ProductModel
+from src.infrastructure.repositories import MySQLUserRepository
+from src.infrastructure.repositories.tiered_cache_repository import TieredCacheRepository
+from src.interfaces.api import router as api
+from src.interfaces.api.response_cache import ResponseCache
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+remote_cache = InMemoryCacheRepository(cache_codec)
+cache = (
+    TieredCacheRepository(remote_cache, local_cache, codec=cache_codec)
+    if settings.CACHE_L1_ENABLED
+    else remote_cache
+)
+
+
+def clear_caches():
+    remote_cache.clear()
+    local_cache.clear()
+
+
+async def setup(db_path: str, product_count: int, cache_repository: CacheRepository = cache):
+    """Point the app at SQLite and ``cache_repository`` (the in-memory cache by default), then seed the catalogue."""
+    engine = database.create_engine(f"sqlite+aiosqlite:///{db_path}", "benchmark")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_db():
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def get_product_service(db: AsyncSession = Depends(database.get_db)):
+        return ProductServiceImpl(SQLiteProductRepository(db), cache_repository, metrics_recorder)
+
+    async def get_user_service(db: AsyncSession = Depends(database.get_db)):
+        return UserServiceImpl(MySQLUserRepository(db), cache_repository)
+
+    async def get_response_cache():
+        return ResponseCache(
+            cache_repository,
+            settings.RESPONSE_CACHE_TTL,
+            settings.RESPONSE_CACHE_GZIP_MIN_BYTES,
+            settings.RESPONSE_CACHE_ENABLED,
+        )
+
+    app.dependency_overrides[database.get_db] = get_db
+    app.dependency_overrides[api.get_product_service] = get_product_service
+    app.dependency_overrides[api.get_user_service] = get_user_service
+    app.dependency_overrides[api.get_response_cache] = get_response_cache
+
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+        await conn.run_sync(database.Base.metadata.create_all)
+        await conn.execute(
+            insert(ProductModel),
+            [
+                {
+                    "name": f"Product {index}",
+                    "description": f"Description for product {index}",
+                    "price": 1.0 + index % 500,
+                    "stock": index % 7,
+                }
+                for index in range(1, product_count + 1)
+            ],
+        )
+    return engine
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> dict:
+    for index in range(warmup):
+        await send(index)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def run_benchmarks(args) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = await setup(os.path.join(tmp, "benchmark.sqlite"), args.products)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            user = {"username": "benchmark", "email": "benchmark@example.com", "password": "benchmark"}
+            await client.post("/api/users", json=user)
+            login_form = {"username": user["email"], "password": user["password"]}
+            token = (await client.post("/api/login", data=login_form)).json()["access_token"]
+            auth = {"Authorization": f"Bearer {token}"}
+
+            results["GET /products"] = await run_scenario(
+                lambda i: client.get("/api/products"),
+                args.requests, args.concurrency, warmup=20,
+            )
+            results["GET /products/{id} hot"] = await run_scenario(
+                lambda i: client.get("/api/products/1"),
+                args.requests, args.concurrency, warmup=20,
+            )
+            clear_caches()
+            results["GET /products/{id} cold"] = await run_scenario(
+                lambda i: client.get(f"/api/products/{i + 1}"),
+                min(args.requests, args.products), args.concurrency,
+            )
+            results["POST /login"] = await run_scenario(
+                lambda i: client.post("/api/login", data=login_form),
+                args.login_requests, args.concurrency,
+            )
+            results["PUT /products/{id}"] = await run_scenario(
+                lambda i: client.put(
+                    f"/api/products/{i % args.products + 1}",
+                    json={"price": 10.0 + i % 100},
+                    headers=auth,
+                ),
+                args.write_requests, args.concurrency, warmup=5,
+            )
+        await engine.dispose()
+    return results
+
+
+def find_regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            continue
+        if actual["throughput_rps"] < expected["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {actual['throughput_rps']} rps < baseline {expected['throughput_rps']} rps"
+            )
+        if actual["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {actual['p95_ms']} ms > baseline {expected['p95_ms']} ms")
+        if actual["errors"] > expected.get("errors", 0):
+            regressions.append(f"{name}: {actual['errors']} errors (baseline {expected.get('errors', 0)})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read scenario")
+    parser.add_argument("--login-requests", type=int, default=64)
+    parser.add_argument("--write-requests", type=int, default=500)
+    parser.add_argument("--products", type=int, default=2000, help="products seeded into the catalogue")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+    print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Compare the cache codecs on the values the services actually cache.
+
+``json`` is the format used before codecs existed: JSON text with datetimes
+as ISO 8601 strings, rebuilt into domain objects (datetimes parsed back) by
+src.application.cached_records after decoding. ``binary`` is src.infrastructure.cache_codecs.BinaryCacheCodec,
+which returns domain objects (with real datetimes) directly. Decode timings
+include building the domain objects, since that is what a cache hit costs.
+
+    python -m benchmarks.cache_codec_benchmark --repeat 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from src.application.cached_records import product_from_cache, user_from_cache
+from src.domain.models import Product, User
+from src.infrastructure.cache_codecs import BinaryCacheCodec, JsonCacheCodec
+from src.infrastructure.config import settings
+
+
+def make_product(index: int) -> Product:
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return Product(
+        id=index,
+        name=f"Product {index}",
+        description=f"Description for product {index}, long enough to look like real copy",
+        price=1.0 + index % 500,
+        stock=index % 7,
+        created_at=now,
+        updated_at=now,
+        version=1 + index % 3,
+    )
+
+
+def samples() -> Dict[str, tuple]:
+    """name -> (value as the service caches it, rebuild the domain objects from a hit)"""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return {
+        "product_entry": (
+            {"v": make_product(1), "e": time.time() + 3600, "d": 0.002},
+            lambda entry: product_from_cache(entry["v"]),
+        ),
+        "user_principal": (
+            User(id=1, username="alice", email="alice@example.com", created_at=now, updated_at=now),
+            user_from_cache,
+        ),
+        "search_page_20": (
+            {"items": [make_product(index) for index in range(20)], "next_offset": 20},
+            lambda page: [product_from_cache(item) for item in page["items"]],
+        ),
+        "product_list_200": (
+            [make_product(index) for index in range(200)],
+            lambda items: [product_from_cache(item) for item in items],
+        ),
+    }
+
+
+def measure(operation: Callable[[], Any], repeat: int) -> float:
+    """Best-of-five mean time per call, in microseconds."""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            operation()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return round(best * 1_000_000, 2)
+
+
+def run(repeat: int) -> dict:
+    codecs = {
+        "json": JsonCacheCodec(),
+        "binary": BinaryCacheCodec(settings.CACHE_COMPRESS_MIN_BYTES),
+    }
+    results: Dict[str, Dict[str, dict]] = {}
+    for name, (value, rebuild) in samples().items():
+        results[name] = {}
+        expected: List[Any] = []
+        for codec_name, codec in codecs.items():
+            encoded = codec.encode(value)
+            rebuilt = rebuild(codec.decode(encoded))
+            expected.append(rebuilt)
+            results[name][codec_name] = {
+                "bytes": len(encoded),
+                "encode_us": measure(lambda: codec.encode(value), repeat),
+                "decode_us": measure(lambda: rebuild(codec.decode(encoded)), repeat),
+            }
+        assert all(rebuilt == rebuild(value) for rebuilt in expected)
+        json_result, binary_result = results[name]["json"], results[name]["binary"]
+        results[name]["size_ratio"] = round(binary_result["bytes"] / json_result["bytes"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
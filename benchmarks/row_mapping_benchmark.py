@@ -0,0 +1,125 @@
+"""
+Compare the ORM-entity read path with the column/lambda read path on 100k products.
+
+``orm_entities`` is how MySQLProductRepository used to read: it selected ProductModel
+entities into the session identity map and copied them field by field into a
+regular (``__dict__``-backed) dataclass. ``lean_rows`` is the current
+``MySQLProductRepository.get_all``. It uses a cached lambda statement over plain
+columns and builds slotted Product objects straight from the rows.
+
+    python -m benchmarks.row_mapping_benchmark --products 100000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.infrastructure.database import Base
+from src.infrastructure.models import ProductModel
+from src.infrastructure.repositories import MySQLProductRepository
+
+
+@dataclass
+class UnslottedProduct:
+    id: Optional[int] = None
+    name: str = ""
+    description: str = ""
+    price: float = 0.0
+    stock: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+async def orm_entities(session: AsyncSession):
+    result = await session.execute(select(ProductModel))
+    return [
+        UnslottedProduct(
+            id=product.id,
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            stock=product.stock,
+            created_at=product.created_at,
+            updated_at=product.updated_at
+        )
+        for product in result.scalars().all()
+    ]
+
+
+async def lean_rows(session: AsyncSession):
+    return await MySQLProductRepository(session).get_all()
+
+
+async def measure(session_factory, load) -> dict:
+    # One untimed pass warms the statement caches
+    async with session_factory() as session:
+        await load(session)
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with session_factory() as session:
+        products = await load(session)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": len(products),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(len(products) / elapsed),
+        "peak_mb": round(peak / 2**20, 1),
+        "retained_mb": round(retained / 2**20, 1),
+    }
+
+
+async def run(product_count: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'products.sqlite')}")
+        session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(ProductModel),
+                [
+                    {
+                        "name": f"Product {index}",
+                        "description": f"Description for product {index}",
+                        "price": 1.0 + index % 500,
+                        "stock": index % 7,
+                    }
+                    for index in range(1, product_count + 1)
+                ],
+            )
+
+        results = {
+            "orm_entities": await measure(session_factory, orm_entities),
+            "lean_rows": await measure(session_factory, lean_rows),
+        }
+        await engine.dispose()
+
+    results["speedup"] = round(results["orm_entities"]["seconds"] / results["lean_rows"]["seconds"], 1)
+    results["peak_memory_ratio"] = round(results["orm_entities"]["peak_mb"] / results["lean_rows"]["peak_mb"], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.products)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the product list serialization paths on a 10k-item response.
+
+``response_model`` is FastAPI's default path: it validates the dataclasses against
+List[ProductResponse], converts the result with jsonable_encoder and encodes it
+with JSONResponse. ``type_adapter`` is the precompiled fast path in
+src.interfaces.api.serialization.
+
+    python -m benchmarks.serialization_benchmark --items 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.domain.models import Product
+from src.interfaces.api.schemas import ProductResponse
+from src.interfaces.api.serialization import product_list_json
+
+
+def make_products(count: int) -> List[Product]:
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return [
+        Product(
+            id=index,
+            name=f"Product {index}",
+            description=f"Description for product {index}",
+            price=1.0 + index % 500,
+            stock=index % 7,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+async def response_model_path(field, products: List[Product]) -> bytes:
+    content = await serialize_response(field=field, response_content=products)
+    return JSONResponse(content).body
+
+
+async def type_adapter_path(field, products: List[Product]) -> bytes:
+    return product_list_json(products).body
+
+
+async def measure(path, field, products: List[Product], repeat: int) -> dict:
+    body = await path(field, products)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(field, products)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    best = timings[0]
+    return {
+        "best_ms": round(best * 1000, 2),
+        "median_ms": round(timings[len(timings) // 2] * 1000, 2),
+        "items_per_second": round(len(products) / best),
+        "bytes": len(body),
+    }
+
+
+async def run(items: int, repeat: int) -> dict:
+    products = make_products(items)
+    field = create_response_field(name="Response_get_products", type_=List[ProductResponse])
+
+    # Both paths must produce the same document
+    expected = json.loads(await response_model_path(field, products))
+    assert json.loads(await type_adapter_path(field, products)) == expected
+
+    results = {
+        "response_model": await measure(response_model_path, field, products, repeat),
+        "type_adapter": await measure(type_adapter_path, field, products, repeat),
+    }
+    results["speedup"] = round(results["response_model"]["best_ms"] / results["type_adapter"]["best_ms"], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.items, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.exc import OperationalError
+
+from src.domain.ports.repositories import CacheCodec, CachePipeline, CacheRepository
+from src.domain.ports.repositories.cache_repository import expiry_for
+from src.infrastructure.cache_codecs import JsonCacheCodec
+from src.infrastructure.repositories import MySQLProductRepository
+
+
+class InMemoryCachePipeline(CachePipeline):
+    def __init__(self, cache: "InMemoryCacheRepository"):
+        self.cache = cache
+        self.commands: List[Callable[[], Awaitable[Any]]] = []
+        self._results: List[Any] = []
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        self.commands.append(lambda: self.cache.set(key, value, expire))
+
+    def delete(self, *keys: str):
+        self.commands.append(lambda: self.cache.delete_many(list(keys)))
+
+    def increment(self, key: str, amount: int = 1, initial: int = 0, expire: Optional[int] = None):
+        self.commands.append(lambda: self.cache.increment_counter(key, amount, initial, expire))
+
+    def expire(self, key: str, seconds: int):
+        self.commands.append(lambda: self.cache.expire(key, seconds))
+
+    @property
+    def results(self) -> List[Any]:
+        return self._results
+
+
+class InMemoryCacheRepository(CacheRepository):
+    """Stand-in for RedisCacheRepository that keeps encoded values in a dict."""
+
+    def __init__(self, codec: Optional[CacheCodec] = None):
+        self.codec = codec or JsonCacheCodec()
+        self._data: Dict[str, Tuple[Optional[float], Any]] = {}
+
+    def clear(self):
+        self._data.clear()
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._decode(self._lookup(key))
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        self._store(key, value, expire)
+        return True
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        return self._lookup(key)
+
+    async def set_bytes(self, key: str, value: bytes, expire: Optional[int] = None) -> bool:
+        self._data[key] = (time.monotonic() + expire if expire else None, value)
+        return True
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [self._decode(self._lookup(key)) for key in keys]
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        for key, value in items.items():
+            self._store(key, value, expiry_for(key, expire, jitter))
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    async def delete_many(self, keys: List[str]) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def exists(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[CachePipeline]:
+        # Single-threaded, so running the queue without awaiting anything else is atomic
+        pipe = InMemoryCachePipeline(self)
+        yield pipe
+        for command in pipe.commands:
+            pipe.results.append(await command())
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        value = self._lookup(key)
+        if value is None:
+            return False
+        self._data[key] = (time.monotonic() + seconds, value)
+        return True
+
+    async def increment(self, key: str, amount: int = 1) -> int:
+        value = int(self._lookup(key) or 0) + amount
+        expires_at = self._data[key][0] if key in self._data else None
+        # Stored as decimal text, like a Redis counter
+        self._data[key] = (expires_at, str(value).encode())
+        return value
+
+    async def increment_counter(self, key: str, amount: int, initial: int, expire: Optional[int]) -> int:
+        """What RedisCachePipeline.increment runs as one script."""
+        if self._lookup(key) is None:
+            self._data[key] = (None, str(initial).encode())
+        value = await self.increment(key, amount)
+        if expire:
+            await self.expire(key, expire)
+        return value
+
+    async def increment_score(self, key: str, member: str, amount: float = 1.0) -> float:
+        scores = self._lookup(key)
+        if scores is None:
+            scores = {}
+            self._data[key] = (None, scores)
+        scores[member] = scores.get(member, 0.0) + amount
+        return scores[member]
+
+    async def top_members(self, key: str, count: int) -> List[str]:
+        scores = self._lookup(key) or {}
+        return sorted(scores, key=scores.get, reverse=True)[:count]
+
+    async def remove_members(self, key: str, *members: str) -> int:
+        scores = self._lookup(key) or {}
+        return sum(scores.pop(member, None) is not None for member in members)
+
+    async def decay_scores(self, key: str, factor: float, min_score: float) -> int:
+        scores = self._lookup(key) or {}
+        dropped = 0
+        for member in list(scores):
+            scores[member] *= factor
+            if scores[member] < min_score:
+                del scores[member]
+                dropped += 1
+        return dropped
+
+    async def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        if self._lookup(key) is not None:
+            return None
+        token = uuid.uuid4().hex
+        self._data[key] = (time.monotonic() + ttl_ms / 1000, token)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        if self._lookup(key) == token:
+            del self._data[key]
+            return True
+        return False
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _store(self, key: str, value: Any, expire: Optional[int]):
+        self._data[key] = (time.monotonic() + expire if expire else None, self.codec.encode(value))
+
+    def _decode(self, data: Any) -> Optional[Any]:
+        if data:
+            return self.codec.decode(data)
+        return None
+
+
+class SQLiteProductRepository(MySQLProductRepository):
+    """MySQLProductRepository on the SQLite benchmark database."""
+
+    @staticmethod
+    def _is_lock_conflict(exc: OperationalError) -> bool:
+        # SQLite has no error codes here; a busy database is reported by message only
+        args = getattr(exc.orig, "args", ())
+        return bool(args) and args[0] == "database is locked"
@@ -1,22 +1,48 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from src.infrastructure.database import init_db
+from src.infrastructure.cache import init_redis, close_redis
+from src.infrastructure.config import settings
+from src.infrastructure.database import init_db, close_db
+from src.infrastructure.security import password_hasher
 from src.interfaces.http.controllers import controller_router
+from src.interfaces.http.middleware import MetricsMiddleware, QueryTrackingMiddleware, ReadYourWritesMiddleware
+from src.interfaces.http.warmup import warmup
 from src.interfaces.http.error_handlers import (
     validation_exception_handler,
     http_exception_handler_wrapper,
     generic_exception_handler
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the shared pools and start warming them; release everything on shutdown"""
+    if settings.DB_CREATE_SCHEMA:
+        await init_db()
+    await init_redis()
+    # Serve /health right away; /ready turns 200 once warm-up is done
+    warmup.start()
+    try:
+        yield
+    finally:
+        await warmup.stop()
+        await close_redis()
+        await close_db()
+        password_hasher.shutdown()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="FastAPI Hexagonal Architecture Demo",
     description="A demo application using FastAPI with Hexagonal Architecture and MySQL",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,8 +52,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination and revalidation headers browsers may otherwise not read
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "ETag"],
 )
 
+# Pin clients that just wrote to the primary database for a short window
+app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+# Per-request SQL statement counts, slow query log and N+1 warnings
+app.add_middleware(QueryTrackingMiddleware, server_timing=settings.SQL_SERVER_TIMING)
+
+# Outermost middleware so the measured latency covers the whole stack
+app.add_middleware(MetricsMiddleware)
+
 # Register exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler_wrapper)
@@ -37,12 +74,6 @@ app.add_exception_handler(Exception, generic_exception_handler)
 app.include_router(controller_router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    await init_db()
-
-
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,53 @@
+import time
+from typing import List
+
+from src.domain.ports.repositories import CachePipeline, CacheRepository
+
+
+class CacheGenerations:
+    """
+    Tag-based cache invalidation without enumerating keys.
+
+    Every tag (``products``, ``product:42``) has a generation counter in the
+    cache. Keys that depend on a tag embed its current generation, so bumping
+    the tag makes all of them unreachable in O(1); the orphaned entries expire
+    through their TTL.
+
+    A missing counter (evicted, flushed or expired) always restarts from the
+    clock in milliseconds, above any generation it reached before, so entries
+    keyed with an old generation never become reachable again. Counters expire
+    ``ttl`` seconds after their last bump, well after the keys that depend on
+    them.
+    """
+
+    def __init__(self, cache: CacheRepository, prefix: str = "gen", ttl: int = 2 * 24 * 3600):
+        self.cache = cache
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def current(self, tags: List[str]) -> List[int]:
+        keys = [f"{self.prefix}:{tag}" for tag in tags]
+        values = await self.cache.get_many(keys)
+        missing = [position for position, value in enumerate(values) if value is None]
+        if missing:
+            seed = self._seed()
+            async with self.cache.pipeline() as pipe:
+                for position in missing:
+                    pipe.increment(keys[position], 0, seed, self.ttl)
+            for position, value in zip(missing, pipe.results):
+                values[position] = value
+        return [int(value) for value in values]
+
+    def bump(self, pipe: CachePipeline, *tags: str):
+        """Queue a new generation for each tag on ``pipe``."""
+        seed = self._seed()
+        for tag in tags:
+            pipe.increment(f"{self.prefix}:{tag}", 1, seed, self.ttl)
+
+    @staticmethod
+    def _seed() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def key(base: str, generation: int) -> str:
+        return f"{base}@{generation}"
@@ -0,0 +1,31 @@
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Optional
+
+from src.domain.models import Product, User
+
+
+def product_from_cache(value: Any) -> Product:
+    """Product from a decoded cache value: the binary codec returns products, the JSON codec their fields."""
+    if isinstance(value, Product):
+        # The L1 tier hands the same decoded object to every reader; callers get their own
+        return replace(value)
+    product = Product(**value)
+    product.created_at = _parse_datetime(product.created_at)
+    product.updated_at = _parse_datetime(product.updated_at)
+    return product
+
+
+def user_from_cache(value: Any) -> User:
+    """User from a decoded cache value, in either codec's form."""
+    if isinstance(value, User):
+        return replace(value)
+    user = User(**value)
+    user.created_at = _parse_datetime(user.created_at)
+    user.updated_at = _parse_datetime(user.updated_at)
+    return user
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    # JSON carries datetimes as ISO 8601 text; older entries use a space separator, which fromisoformat accepts too
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
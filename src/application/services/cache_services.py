@@ -1,7 +1,7 @@
 # src/application/services/cache_service.py
-from typing import Any, Optional
+from typing import Any, AsyncContextManager, Dict, List, Optional, Union
 from src.domain.ports.services import CacheService
-from src.domain.ports.repositories import CacheRepository
+from src.domain.ports.repositories import CachePipeline, CacheRepository
 
 class CacheServiceImpl(CacheService):
     def __init__(self, cache_repository: CacheRepository):
@@ -17,4 +17,21 @@ class CacheServiceImpl(CacheService):
         return await self.cache_repository.delete(key)
     
     async def has_cached_data(self, key: str) -> bool:
-        return await self.cache_repository.exists(key)
\ No newline at end of file
+        return await self.cache_repository.exists(key)
+    
+    async def get_many_cached_data(self, keys: List[str]) -> List[Optional[Any]]:
+        return await self.cache_repository.get_many(keys)
+    
+    async def cache_many(
+        self,
+        items: Dict[str, Any],
+        expire_seconds: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        return await self.cache_repository.set_many(items, expire_seconds, jitter)
+    
+    async def invalidate_many(self, keys: List[str]) -> int:
+        return await self.cache_repository.delete_many(keys)
+    
+    def pipeline(self, transaction: bool = False) -> AsyncContextManager[CachePipeline]:
+        return self.cache_repository.pipeline(transaction)
@@ -1,38 +1,277 @@
-from dataclasses import asdict
+import asyncio
+from dataclasses import replace
 from datetime import datetime
+import hashlib
 import json
-from typing import List, Optional
-from src.domain.models import Product
+import math
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from src.application.cache_generations import CacheGenerations
+from src.application.cached_records import product_from_cache
+from src.application.single_flight import SingleFlight
+from src.domain.exceptions import ProductVersionConflict, StockContention
+from src.domain.models import Product, ProductPage, ProductSearchPage, ProductUpsertResult
 from src.domain.ports.repositories import ProductRepository, CacheRepository
-from src.domain.ports.services import ProductService
+from src.domain.ports.services import MetricsRecorder, ProductService
+
+# Shared by every service instance in the process so concurrent misses coalesce
+_product_loads = SingleFlight()
+
 
 class ProductServiceImpl(ProductService):
-    def __init__(self, product_repository: ProductRepository, cache: CacheRepository):
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        cache: CacheRepository,
+        metrics: Optional[MetricsRecorder] = None,
+    ):
         self.product_repository = product_repository
         self.cache = cache
+        self.metrics = metrics
+        self.generations = CacheGenerations(cache)
         self.cache_prefix = 'product'
+        self.collection_tag = 'products'  # bumped by every product write
         self.cache_ttl = 3600  # 1 hour
+        self.cache_ttl_jitter = 0.1  # +/- 10% so keys cached together don't expire together
+        self.early_refresh_beta = 1.0  # > 1 favours earlier refreshes
+        self.lock_ttl_ms = 5000
+        self.lock_wait_interval = 0.05
+        self.lock_wait_attempts = 10
+        self.stock_retry_attempts = 4
+        self.stock_retry_base_delay = 0.01  # doubled per retry, with full jitter
+        self.stock_retry_max_delay = 0.2
+        self.search_cache_ttl = 60  # bounds memory only; writes move search to new keys
+        self.search_cache_max_offset = 100  # deeper pages are rarely repeated
+        self.popularity_key = 'product:popularity'
+        self.popularity_sample_rate = 0.05  # one read in 20 updates the ranking
+        # About once per 1000 sampled views, halve every score and drop products
+        # left below one view: keeps the ranking bounded and lets newcomers in
+        self.popularity_decay_rate = 0.001
+        self.popularity_decay_factor = 0.5
+        self.popularity_min_score = 1.0
 
     
     async def get_all_products(self) -> List[Product]:
         return await self.product_repository.get_all()
     
+    async def get_products_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> ProductPage:
+        # Fetch one extra row to know whether another page follows
+        products = await self.product_repository.get_page(
+            limit + 1, after_id, min_price, max_price, in_stock
+        )
+        if len(products) > limit:
+            products = products[:limit]
+            return ProductPage(items=products, next_after_id=products[-1].id)
+        return ProductPage(items=products)
+    
+    async def search_products(
+        self,
+        text: Optional[str],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> ProductSearchPage:
+        # Normalise so trivially different spellings of a query share one cache entry
+        text = " ".join(text.lower().split()) if text else None
+        params = [text, min_price, max_price, in_stock, sort, limit, offset]
+        cache_key = None
+        if offset < self.search_cache_max_offset:
+            digest = hashlib.sha1(json.dumps(params).encode()).hexdigest()
+            cache_key = self.generations.key(f"search:{digest}", await self.get_collection_version())
+            cached_page = await self.cache.get(cache_key)
+            self._record_lookup(cached_page is not None, "search")
+            if cached_page is not None:
+                return ProductSearchPage(
+                    items=[self._as_product(item) for item in cached_page["items"]],
+                    next_offset=cached_page["next_offset"],
+                )
+        
+        # Fetch one extra row to know whether another page follows
+        products = await self.product_repository.search(
+            text, min_price, max_price, in_stock, sort, limit + 1, offset
+        )
+        page = ProductSearchPage(items=products)
+        if len(products) > limit:
+            page = ProductSearchPage(items=products[:limit], next_offset=offset + limit)
+        
+        if cache_key is not None:
+            entry = {"items": page.items, "next_offset": page.next_offset}
+            await self.cache.set(cache_key, entry, self.search_cache_ttl)
+        return page
+    
+    async def warm_cache(self, count: int) -> int:
+        """Load the most requested products into the cache; returns how many were found."""
+        ranked = await self.cache.top_members(self.popularity_key, count)
+        if not ranked:
+            return 0
+        return len(await self.get_products([int(product_id) for product_id in ranked]))
+    
+    def export_products(self, batch_size: int = 1000) -> AsyncIterator[List[Product]]:
+        return self.product_repository.stream_all(batch_size)
+    
+    async def record_view(self, product_id: int):
+        if random.random() < self.popularity_sample_rate:
+            await self.cache.increment_score(self.popularity_key, str(product_id))
+            if random.random() < self.popularity_decay_rate:
+                await self.cache.decay_scores(
+                    self.popularity_key, self.popularity_decay_factor, self.popularity_min_score
+                )
+    
     async def get_product(self, product_id: int) -> Optional[Product]:
-        cache_key = f"{self.cache_prefix}:{product_id}"
-        cached_product = await self.cache.get(cache_key)
-        if cached_product:
-            product_data = json.loads(cached_product)
-            return Product(**product_data)
+        cache_key = self._product_key(product_id, await self.get_product_generation(product_id))
         
-
-        product = await self.product_repository.get_by_id(product_id)
+        cached_entry = await self.cache.get(cache_key)
+        self._record_lookup(bool(cached_entry))
+        if cached_entry:
+            product, expires_at, delta = self._unpack_entry(cached_entry)
+            if self._should_refresh_early(expires_at, delta):
+                # Refresh ahead of expiry; callers that lose the race keep the cached copy
+                product = self._own_copy(
+                    await _product_loads.do(cache_key, lambda: self._load_product(product_id, cache_key, product))
+                )
+        else:
+            product = self._own_copy(
+                await _product_loads.do(cache_key, lambda: self._load_product(product_id, cache_key))
+            )
         
-        # Lưu vào cache nếu tìm thấy
-        if product:
-            product_dict = asdict(product)
-            await self.cache.set(cache_key, json.dumps(product_dict, default=str), self.cache_ttl)
+        # Unknown ids must not enter the ranking the warm-up preloads from
+        if product is not None:
+            await self.record_view(product_id)
         return product
     
+    @staticmethod
+    def _own_copy(product: Optional[Product]) -> Optional[Product]:
+        # Every caller that joined a flight gets the same object; one must not change it for the others
+        return replace(product) if product is not None else None
+    
+    async def _load_product(
+        self, product_id: int, cache_key: str, stale: Optional[Product] = None
+    ) -> Optional[Product]:
+        lock_key = f"lock:{cache_key}"
+        token = await self.cache.acquire_lock(lock_key, self.lock_ttl_ms)
+        
+        if token is None:
+            if stale is not None:
+                return stale
+            # Another worker is loading this product; give it a moment to fill the cache
+            for _ in range(self.lock_wait_attempts):
+                await asyncio.sleep(self.lock_wait_interval)
+                cached_entry = await self.cache.get(cache_key)
+                if cached_entry:
+                    return self._unpack_entry(cached_entry)[0]
+        
+        try:
+            started = time.monotonic()
+            product = await self.product_repository.get_by_id(product_id)
+            
+            # Lưu vào cache nếu tìm thấy
+            if product:
+                ttl = self._jittered_ttl()
+                entry = self._pack_entry(product, ttl, time.monotonic() - started)
+                await self.cache.set(cache_key, entry, ttl)
+            return product
+        finally:
+            if token is not None:
+                await self.cache.release_lock(lock_key, token)
+    
+    def _record_lookup(self, hit: bool, cache: Optional[str] = None):
+        if self.metrics is not None:
+            self.metrics.record_cache_lookup(cache or self.cache_prefix, hit)
+    
+    def _jittered_ttl(self) -> int:
+        jitter = random.uniform(-self.cache_ttl_jitter, self.cache_ttl_jitter)
+        return max(1, int(self.cache_ttl * (1 + jitter)))
+    
+    @staticmethod
+    def _pack_entry(product: Product, ttl: int, delta: float) -> dict:
+        """Cached value plus the metadata needed for probabilistic early refresh."""
+        return {"v": product, "e": time.time() + ttl, "d": delta}
+    
+    @classmethod
+    def _unpack_entry(cls, entry: Any) -> Tuple[Product, Optional[float], float]:
+        if "v" not in entry:
+            # Entry written before refresh metadata existed
+            return cls._as_product(entry), None, 0.0
+        return cls._as_product(entry["v"]), entry["e"], entry["d"]
+    
+    @staticmethod
+    def _as_product(value: Any) -> Product:
+        return product_from_cache(value)
+    
+    def _should_refresh_early(self, expires_at: Optional[float], delta: float) -> bool:
+        """XFetch: refresh with a probability that rises as expiry approaches."""
+        if expires_at is None or delta <= 0:
+            return False
+        return time.time() - delta * self.early_refresh_beta * math.log(1.0 - random.random()) >= expires_at
+    
+    async def get_collection_version(self) -> int:
+        # Generations are never reused, so ETags built from them stay unique too
+        return (await self.generations.current([self.collection_tag]))[0]
+    
+    async def get_product_generation(self, product_id: int) -> int:
+        return (await self.generations.current([self._product_tag(product_id)]))[0]
+    
+    def _product_tag(self, product_id: int) -> str:
+        return f"{self.cache_prefix}:{product_id}"
+    
+    def _product_key(self, product_id: int, generation: int) -> str:
+        return self.generations.key(self._product_tag(product_id), generation)
+    
+    async def _after_write(self, *product_ids: int):
+        """Invalidate the written products and every collection now, and again once committed."""
+        tags = [self.collection_tag] + [self._product_tag(product_id) for product_id in product_ids]
+        
+        async def invalidate():
+            async with self.cache.pipeline() as pipe:
+                self.generations.bump(pipe, *tags)
+        
+        # A read between the first bump and the commit may have cached the old row
+        self.product_repository.on_commit(invalidate)
+        await invalidate()
+    
+    async def get_products(self, product_ids: List[int]) -> List[Product]:
+        product_ids = list(dict.fromkeys(product_ids))
+        generations = await self.generations.current([self._product_tag(product_id) for product_id in product_ids])
+        cache_keys = dict(zip(product_ids, map(self._product_key, product_ids, generations)))
+        cached_products = await self.cache.get_many(list(cache_keys.values()))
+        
+        found = {}
+        missing_ids = []
+        for product_id, cached_entry in zip(product_ids, cached_products):
+            self._record_lookup(bool(cached_entry))
+            if cached_entry:
+                found[product_id] = self._unpack_entry(cached_entry)[0]
+            else:
+                missing_ids.append(product_id)
+        
+        if missing_ids:
+            started = time.monotonic()
+            loaded = await self.product_repository.get_by_ids(missing_ids)
+            if loaded:
+                delta = time.monotonic() - started
+                entries, ttls = {}, {}
+                for product in loaded:
+                    # Jittered per key, so products loaded together do not expire together
+                    cache_key = cache_keys[product.id]
+                    ttls[cache_key] = self._jittered_ttl()
+                    entries[cache_key] = self._pack_entry(product, ttls[cache_key], delta)
+                await self.cache.set_many(entries, ttls)
+            for product in loaded:
+                found[product.id] = product
+        
+        return [found[product_id] for product_id in product_ids if product_id in found]
+    
     async def create_product(self, product: Product) -> Product:
         if not product.is_valid():
             raise ValueError("Invalid product data")
@@ -40,7 +279,9 @@ class ProductServiceImpl(ProductService):
         product.created_at = datetime.utcnow()
         product.updated_at = product.created_at
         
-        return await self.product_repository.create(product)
+        created_product = await self.product_repository.create(product)
+        await self._after_write()
+        return created_product
     
     async def update_product(self, product_id: int, product: Product) -> Optional[Product]:
         existing_product = await self.product_repository.get_by_id(product_id)
@@ -53,10 +294,128 @@ class ProductServiceImpl(ProductService):
         product.id = product_id
         product.created_at = existing_product.created_at
         product.updated_at = datetime.utcnow()
+        if product.version is None:
+            # Still guards against writes that land between the read above and the update
+            product.version = existing_product.version
+        
+        updated_product = await self.product_repository.update(product)
+        await self._after_write(product_id)
+        return updated_product
+    
+    async def patch_product(
+        self,
+        product_id: int,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Product]:
+        if "name" in changes and not changes["name"]:
+            raise ValueError("Invalid product data")
+        if "price" in changes and (changes["price"] is None or changes["price"] <= 0):
+            raise ValueError("Invalid product data")
+        if "stock" in changes and (changes["stock"] is None or changes["stock"] < 0):
+            raise ValueError("Invalid product data")
+        
+        found = await self.product_repository.update_fields(
+            product_id, {**changes, "updated_at": datetime.utcnow()}, expected_version
+        )
+        if not found:
+            if expected_version is not None and await self.product_repository.get_by_id(product_id):
+                raise ProductVersionConflict(product_id)
+            return None
+        
+        # Evict rather than rewrite the entry: a concurrent patch could otherwise
+        # leave the older of two versions in the cache
+        await self._after_write(product_id)
+        # Writes read from the primary, and the UPDATE still holds the row lock,
+        # so this returns exactly the row this request wrote
+        return await self.product_repository.get_by_id(product_id)
+    
+    async def reserve_stock(self, quantities: Dict[int, int]) -> List[int]:
+        return await self._change_stock(
+            quantities, self.product_repository.reserve_stock, "reserved", "insufficient"
+        )
+    
+    async def release_stock(self, quantities: Dict[int, int]) -> List[int]:
+        return await self._change_stock(
+            quantities, self.product_repository.release_stock, "released", "missing"
+        )
+    
+    async def _change_stock(
+        self,
+        quantities: Dict[int, int],
+        apply,
+        outcome: str,
+        failure: str,
+    ) -> List[int]:
+        """Apply an all-or-nothing stock change, retrying lock conflicts with bounded backoff."""
+        for attempt in range(self.stock_retry_attempts):
+            try:
+                failed_ids = await apply(quantities)
+                break
+            except StockContention as exc:
+                if attempt == self.stock_retry_attempts - 1:
+                    self._record_stock(exc.product_id, "aborted")
+                    raise
+                self._record_stock(exc.product_id, "retried")
+                delay = min(self.stock_retry_max_delay, self.stock_retry_base_delay * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+        
+        if failed_ids:
+            for product_id in failed_ids:
+                self._record_stock(product_id, failure)
+            return failed_ids
+        
+        for product_id in quantities:
+            self._record_stock(product_id, outcome)
+        await self._after_write(*quantities)
+        return []
+    
+    def _record_stock(self, product_id: int, outcome: str):
+        if self.metrics is not None:
+            self.metrics.record_stock_update(product_id, outcome)
+    
+    async def bulk_upsert_products(self, products: List[Product]) -> List[ProductUpsertResult]:
+        results = [ProductUpsertResult(index=index) for index in range(len(products))]
+        valid = []
+        seen_ids = set()
+        now = datetime.utcnow()
+        
+        for result, product in zip(results, products):
+            if not product.is_valid():
+                result.status = "error"
+                result.error = "Invalid product data"
+                continue
+            if product.id is not None:
+                # A second write to the same row in one statement would be reported twice
+                if product.id in seen_ids:
+                    result.status = "error"
+                    result.error = "Duplicate product id in batch"
+                    continue
+                seen_ids.add(product.id)
+            product.created_at = now
+            product.updated_at = now
+            valid.append((result, product))
+        
+        if not valid:
+            return results
+        
+        created_flags = await self.product_repository.bulk_upsert([product for _, product in valid])
+        
+        updated_ids = []
+        for (result, product), created in zip(valid, created_flags):
+            result.status = "created" if created else "updated"
+            result.product = product
+            if not created:
+                updated_ids.append(product.id)
         
-        return await self.product_repository.update(product)
+        await self._after_write(*updated_ids)
+        return results
     
     async def delete_product(self, product_id: int) -> bool:
-        return await self.product_repository.delete(product_id)
+        deleted = await self.product_repository.delete(product_id)
+        await self._after_write(product_id)
+        if deleted:
+            await self.cache.remove_members(self.popularity_key, str(product_id))
+        return deleted
 
 
@@ -1,17 +1,37 @@
+from dataclasses import replace
 from datetime import datetime
 from typing import Optional
+from src.application.cached_records import user_from_cache
 from src.domain.models import User
-from src.domain.ports.repositories import UserRepository
+from src.domain.ports.repositories import CacheRepository, UserRepository
 from src.domain.ports.services import UserService
 
 
 class UserServiceImpl(UserService):
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, cache: Optional[CacheRepository] = None):
         self.user_repository = user_repository
+        self.cache = cache
+        self.cache_prefix = 'user'
     
     async def get_user(self, user_id: int) -> Optional[User]:
         return await self.user_repository.get_by_id(user_id)
     
+    async def get_authenticated_user(self, user_id: int, max_ttl: int) -> Optional[User]:
+        """Principal lookup for authentication, cached for at most max_ttl seconds."""
+        if self.cache is None or max_ttl <= 0:
+            return await self.user_repository.get_by_id(user_id)
+        
+        cache_key = f"{self.cache_prefix}:{user_id}"
+        cached_user = await self.cache.get(cache_key)
+        if cached_user:
+            return user_from_cache(cached_user)
+        
+        user = await self.user_repository.get_by_id(user_id)
+        if user:
+            # The password hash is never needed after the token is issued
+            await self.cache.set(cache_key, replace(user, hashed_password=""), max_ttl)
+        return user
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         return await self.user_repository.get_by_email(email)
     
@@ -40,7 +60,24 @@ class UserServiceImpl(UserService):
         user.created_at = existing_user.created_at
         user.updated_at = datetime.utcnow()
         
-        return await self.user_repository.update(user)
+        updated_user = await self.user_repository.update(user)
+        await self._invalidate(user_id)
+        return updated_user
     
     async def delete_user(self, user_id: int) -> bool:
-        return await self.user_repository.delete(user_id)
\ No newline at end of file
+        deleted = await self.user_repository.delete(user_id)
+        await self._invalidate(user_id)
+        return deleted
+    
+    async def _invalidate(self, user_id: int):
+        """Evict the cached principal now, and again once committed."""
+        if self.cache is None:
+            return
+        cache_key = f"{self.cache_prefix}:{user_id}"
+        
+        async def evict():
+            await self.cache.delete(cache_key)
+        
+        # An authenticated request before the commit may have cached the old row again
+        self.user_repository.on_commit(evict)
+        await evict()
\ No newline at end of file
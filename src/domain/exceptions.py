@@ -0,0 +1,14 @@
+class ProductVersionConflict(Exception):
+    """The product changed after the version an update was based on."""
+
+    def __init__(self, product_id: int):
+        super().__init__(f"Product {product_id} was modified concurrently")
+        self.product_id = product_id
+
+
+class StockContention(Exception):
+    """A stock update lost a lock race (deadlock or lock wait timeout); the whole change may be retried."""
+
+    def __init__(self, product_id: int):
+        super().__init__(f"Lock conflict while updating stock of product {product_id}")
+        self.product_id = product_id
@@ -1,9 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: Optional[int] = None
     name: str = ""
@@ -12,6 +12,7 @@ class Product:
     stock: int = 0
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    version: Optional[int] = None  # bumped by every write; used for optimistic concurrency
 
     def is_in_stock(self) -> bool:
         return self.stock > 0
@@ -25,6 +26,26 @@ class Product:
 
 
 @dataclass
+class ProductPage:
+    items: List[Product] = field(default_factory=list)
+    next_after_id: Optional[int] = None
+
+
+@dataclass
+class ProductSearchPage:
+    items: List[Product] = field(default_factory=list)
+    next_offset: Optional[int] = None
+
+
+@dataclass
+class ProductUpsertResult:
+    index: int
+    status: str = ""  # "created", "updated" or "error"
+    product: Optional[Product] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
 class User:
     id: Optional[int] = None
     username: str = ""
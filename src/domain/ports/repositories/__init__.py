@@ -1,3 +1,3 @@
 from src.domain.ports.repositories.product_repository import ProductRepository
 from src.domain.ports.repositories.user_repository import UserRepository
-from src.domain.ports.repositories.cache_repository import CacheRepository
\ No newline at end of file
+from src.domain.ports.repositories.cache_repository import CacheCodec, CachePipeline, CacheRepository
\ No newline at end of file
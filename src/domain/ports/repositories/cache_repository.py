@@ -1,6 +1,59 @@
 # src/domain/ports/cache_port.py
+import random
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, AsyncContextManager, Dict, List, Optional, Union
+
+
+def expiry_for(key: str, expire: Union[int, Dict[str, int], None], jitter: float = 0.0) -> Optional[int]:
+    """TTL of one key of a CacheRepository.set_many call, with the jitter applied."""
+    ttl = expire.get(key) if isinstance(expire, dict) else expire
+    if ttl and jitter:
+        ttl = max(1, round(ttl * (1 + random.uniform(-jitter, jitter))))
+    return ttl
+
+
+class CacheCodec(ABC):
+    """Converts cached values to the bytes kept in the remote cache and back."""
+    
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+    
+    @abstractmethod
+    def decode(self, data: bytes) -> Optional[Any]:
+        """Decoded value, or None for data this codec cannot read (treated as a miss)."""
+        pass
+
+
+class CachePipeline(ABC):
+    """
+    Commands queued inside ``async with cache.pipeline()``. They are sent in one
+    round trip when the block exits, and not at all if it raises.
+    """
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        pass
+    
+    @abstractmethod
+    def delete(self, *keys: str):
+        pass
+    
+    @abstractmethod
+    def increment(self, key: str, amount: int = 1, initial: int = 0, expire: Optional[int] = None):
+        """Add to a counter that starts from ``initial`` if missing; ``expire`` (re)sets its TTL."""
+        pass
+    
+    @abstractmethod
+    def expire(self, key: str, seconds: int):
+        pass
+    
+    @property
+    @abstractmethod
+    def results(self) -> List[Any]:
+        """Raw reply of every queued command, in order, once the block has exited."""
+        pass
+
 
 class CacheRepository(ABC):
     @abstractmethod
@@ -11,10 +64,80 @@ class CacheRepository(ABC):
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         pass
     
+    @abstractmethod
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Raw value, returned exactly as stored by set_bytes (no JSON decoding)."""
+        pass
+    
+    @abstractmethod
+    async def set_bytes(self, key: str, value: bytes, expire: Optional[int] = None) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        pass
+    
+    @abstractmethod
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        """
+        Store several values in one round trip. ``expire`` is one TTL for every
+        key or a TTL per key; ``jitter`` spreads each TTL by up to that fraction
+        either way so keys written together do not expire together.
+        """
+        pass
+    
     @abstractmethod
     async def delete(self, key: str) -> bool:
         pass
     
+    @abstractmethod
+    async def delete_many(self, keys: List[str]) -> int:
+        pass
+    
     @abstractmethod
     async def exists(self, key: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def pipeline(self, transaction: bool = False) -> AsyncContextManager[CachePipeline]:
+        """Queue writes and send them together; ``transaction`` also applies them atomically."""
+        pass
+    
+    @abstractmethod
+    async def increment(self, key: str, amount: int = 1) -> int:
+        """Atomically add to an integer counter (missing counts as 0); returns the new value."""
+        pass
+    
+    @abstractmethod
+    async def increment_score(self, key: str, member: str, amount: float = 1.0) -> float:
+        """Add to a member's score in a ranking (sorted set); returns the new score."""
+        pass
+    
+    @abstractmethod
+    async def top_members(self, key: str, count: int) -> List[str]:
+        """Members of a ranking with the highest scores first."""
+        pass
+    
+    @abstractmethod
+    async def remove_members(self, key: str, *members: str) -> int:
+        """Drop members from a ranking; returns how many were there."""
+        pass
+    
+    @abstractmethod
+    async def decay_scores(self, key: str, factor: float, min_score: float) -> int:
+        """Multiply every score in a ranking by ``factor`` and drop members left below ``min_score``; returns how many were dropped."""
+        pass
+    
+    @abstractmethod
+    async def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        """Try to take a short-lived lock; returns an ownership token, or None if it is held."""
+        pass
+    
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> bool:
         pass
\ No newline at end of file
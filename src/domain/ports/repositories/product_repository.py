@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 from src.domain.models import Product, User
 
@@ -8,10 +8,48 @@ class ProductRepository(ABC):
     async def get_all(self) -> List[Product]:
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> List[Product]:
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        text: Optional[str],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Product]:
+        """
+        Full-text search over name and description with optional filters.
+
+        sort is one of relevance, price_asc, price_desc or newest; relevance
+        without text falls back to id order.
+        """
+        pass
+
+    @abstractmethod
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[Product]]:
+        pass
+
     @abstractmethod
     async def get_by_id(self, product_id: int) -> Optional[Product]:
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, product_ids: List[int]) -> List[Product]:
+        pass
+
     @abstractmethod
     async def create(self, product: Product) -> Product:
         pass
@@ -20,6 +58,49 @@ class ProductRepository(ABC):
     async def update(self, product: Product) -> Product:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self,
+        product_id: int,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Set only the given columns in one statement and bump the version.
+
+        Returns False if the product does not exist or, when expected_version is
+        given, is no longer at that version.
+        """
+        pass
+
+    @abstractmethod
+    async def reserve_stock(self, quantities: Dict[int, int]) -> List[int]:
+        """
+        Take stock from every product or from none of them.
+
+        Returns the ids that could not be reserved (missing or not enough stock);
+        raises StockContention when a lock conflict aborted the change.
+        """
+        pass
+
+    @abstractmethod
+    async def release_stock(self, quantities: Dict[int, int]) -> List[int]:
+        """Return stock to every product or to none of them; returns the ids that do not exist."""
+        pass
+
+    @abstractmethod
+    async def bulk_upsert(self, products: List[Product]) -> List[bool]:
+        """
+        Insert or update products in one transaction; returns True for each created row.
+        Ids must be unique within the batch. Every product comes back with its stored version.
+        """
+        pass
+
     @abstractmethod
     async def delete(self, product_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], Awaitable]) -> None:
+        """Schedule callback() for after the current transaction commits; dropped on rollback."""
         pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 
 from src.domain.models import Product, User
 
@@ -26,4 +26,9 @@ class UserRepository(ABC):
 
     @abstractmethod
     async def delete(self, user_id: int) -> bool:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], Awaitable]) -> None:
+        """Schedule callback() for after the current transaction commits; dropped on rollback."""
+        pass
@@ -1,3 +1,4 @@
 from src.domain.ports.services.product_services import ProductService
 from src.domain.ports.services.user_services import UserService
-from src.domain.ports.services.cache_services import CacheService
\ No newline at end of file
+from src.domain.ports.services.cache_services import CacheService
+from src.domain.ports.services.metrics_services import MetricsRecorder
\ No newline at end of file
@@ -1,6 +1,7 @@
 # src/application/services/cache_service.py
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, AsyncContextManager, Dict, List, Optional, Union
+from src.domain.ports.repositories import CachePipeline
 
 class CacheService(ABC):
     @abstractmethod
@@ -17,4 +18,25 @@ class CacheService(ABC):
     
     @abstractmethod
     async def has_cached_data(self, key: str) -> bool:
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def get_many_cached_data(self, keys: List[str]) -> List[Optional[Any]]:
+        pass
+    
+    @abstractmethod
+    async def cache_many(
+        self,
+        items: Dict[str, Any],
+        expire_seconds: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        pass
+    
+    @abstractmethod
+    async def invalidate_many(self, keys: List[str]) -> int:
+        pass
+    
+    @abstractmethod
+    def pipeline(self, transaction: bool = False) -> AsyncContextManager[CachePipeline]:
+        pass
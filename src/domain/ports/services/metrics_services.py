@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class MetricsRecorder(ABC):
+    @abstractmethod
+    def record_cache_lookup(self, cache: str, hit: bool) -> None:
+        pass
+
+    @abstractmethod
+    def record_stock_update(self, product_id: int, outcome: str) -> None:
+        """outcome is one of reserved, released, insufficient, missing, retried or aborted."""
+        pass
@@ -1,16 +1,67 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.models import Product, User
+from typing import Any, AsyncIterator, Dict, List, Optional
+from src.domain.models import Product, ProductPage, ProductSearchPage, ProductUpsertResult, User
 
 class ProductService(ABC):
     @abstractmethod
     async def get_all_products(self) -> List[Product]:
         pass
     
+    @abstractmethod
+    async def get_products_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> ProductPage:
+        pass
+    
+    @abstractmethod
+    async def search_products(
+        self,
+        text: Optional[str],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> ProductSearchPage:
+        pass
+    
+    @abstractmethod
+    async def warm_cache(self, count: int) -> int:
+        pass
+    
+    @abstractmethod
+    def export_products(self, batch_size: int) -> AsyncIterator[List[Product]]:
+        pass
+    
     @abstractmethod
     async def get_product(self, product_id: int) -> Optional[Product]:
         pass
     
+    @abstractmethod
+    async def record_view(self, product_id: int):
+        """Count a read served without get_product towards the popularity ranking."""
+        pass
+    
+    @abstractmethod
+    async def get_collection_version(self) -> int:
+        """Counter that changes after every committed product write."""
+        pass
+    
+    @abstractmethod
+    async def get_product_generation(self, product_id: int) -> int:
+        """Counter that changes after every committed write to the product."""
+        pass
+    
+    @abstractmethod
+    async def get_products(self, product_ids: List[int]) -> List[Product]:
+        pass
+    
     @abstractmethod
     async def create_product(self, product: Product) -> Product:
         pass
@@ -19,6 +70,28 @@ class ProductService(ABC):
     async def update_product(self, product_id: int, product: Product) -> Optional[Product]:
         pass
     
+    @abstractmethod
+    async def patch_product(
+        self,
+        product_id: int,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Product]:
+        """Apply ``changes`` with one UPDATE, then read the row back; None if it does not exist."""
+        pass
+    
+    @abstractmethod
+    async def reserve_stock(self, quantities: Dict[int, int]) -> List[int]:
+        pass
+    
+    @abstractmethod
+    async def release_stock(self, quantities: Dict[int, int]) -> List[int]:
+        pass
+    
+    @abstractmethod
+    async def bulk_upsert_products(self, products: List[Product]) -> List[ProductUpsertResult]:
+        pass
+    
     @abstractmethod
     async def delete_product(self, product_id: int) -> bool:
         pass
@@ -7,6 +7,10 @@ class UserService(ABC):
     async def get_user(self, user_id: int) -> Optional[User]:
         pass
     
+    @abstractmethod
+    async def get_authenticated_user(self, user_id: int, max_ttl: int) -> Optional[User]:
+        pass
+    
     @abstractmethod
     async def get_user_by_email(self, email: str) -> Optional[User]:
         pass
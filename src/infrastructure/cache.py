@@ -1,23 +1,202 @@
 # src/infrastructure/cache.py
-from typing import AsyncGenerator
-from fastapi import Depends
-from redis.asyncio import Redis
+import asyncio
+import logging
+import uuid
+from typing import AsyncGenerator, Optional
+from redis.asyncio import Redis, BlockingConnectionPool
+from src.domain.ports.repositories import CacheCodec, CacheRepository
+from src.infrastructure.cache_codecs import BinaryCacheCodec, JsonCacheCodec
 from src.infrastructure.config import settings
+from src.infrastructure.repositories.redis_cache_repository import RedisCacheRepository
+from src.infrastructure.repositories.tiered_cache_repository import LocalCache, TieredCacheRepository
 
-async def get_redis_client() -> Redis:
-    redis = Redis(
+logger = logging.getLogger(__name__)
+
+
+class MonitoredConnectionPool(BlockingConnectionPool):
+    """Blocking connection pool that keeps track of tasks waiting for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+
+    async def get_connection(self, command_name=None, *keys, **options):
+        if self.can_get_connection():
+            return await super().get_connection(command_name, *keys, **options)
+
+        self.waiters += 1
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            self.waiters -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "waiters": self.waiters,
+        }
+
+
+class CacheInvalidationBus:
+    """Broadcasts evicted keys over Redis pub/sub and drops them from the local L1."""
+
+    def __init__(self, redis: Redis, local: LocalCache, channel: str):
+        self.redis = redis
+        self.local = local
+        self.channel = channel
+        self.node_id = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, *keys: str):
+        await self.redis.publish(self.channel, f"{self.node_id}|" + "\n".join(keys))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        backoff = 0.1
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                self.local.clear()
+                backoff = 0.1
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation listener disconnected: %s", e)
+                self.local.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                await pubsub.close()
+
+    def _handle(self, data: str):
+        node_id, _, keys = data.partition("|")
+        if node_id != self.node_id:
+            for key in keys.split("\n"):
+                self.local.invalidate(key)
+
+
+# Shared pool and client, created once per process by the application lifespan
+redis_pool: Optional[MonitoredConnectionPool] = None
+redis_client: Optional[Redis] = None
+invalidation_bus: Optional[CacheInvalidationBus] = None
+
+
+def create_cache_codec() -> CacheCodec:
+    if settings.CACHE_CODEC == "json":
+        return JsonCacheCodec()
+    return BinaryCacheCodec(settings.CACHE_COMPRESS_MIN_BYTES)
+
+
+# Shared by the Redis adapter and L1, which must agree on the round trip
+cache_codec = create_cache_codec()
+
+# Process-local L1 cache shared by every request on this worker
+local_cache = LocalCache(
+    max_entries=settings.CACHE_L1_MAX_ENTRIES,
+    max_bytes=settings.CACHE_L1_MAX_BYTES,
+    default_ttl=settings.CACHE_L1_TTL,
+    negative_ttl=settings.CACHE_L1_NEGATIVE_TTL,
+)
+
+
+def create_redis_pool() -> MonitoredConnectionPool:
+    return MonitoredConnectionPool(
         host=settings.REDIS_HOST,
         port=settings.REDIS_PORT,
         db=settings.REDIS_DB,
-        password=settings.REDIS_PASSWORD,
-        decode_responses=True
+        password=settings.REDIS_PASSWORD or None,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
     )
-    return redis
 
-# Dependency để cung cấp Redis client
-async def get_redis_dependency() -> AsyncGenerator[Redis, None]:
-    redis = await get_redis_client()
+
+async def init_redis():
+    """Create the shared Redis connection pool and start listening for invalidations."""
+    global redis_pool, redis_client, invalidation_bus
+    if redis_client is None:
+        redis_pool = create_redis_pool()
+        redis_client = Redis(connection_pool=redis_pool)
+    if settings.CACHE_L1_ENABLED and invalidation_bus is None:
+        invalidation_bus = CacheInvalidationBus(redis_client, local_cache, settings.CACHE_INVALIDATION_CHANNEL)
+        invalidation_bus.start()
+
+
+async def warm_up_redis(connections: int) -> int:
+    """Connect up to ``connections`` pooled Redis connections ahead of traffic."""
+    await get_redis_client()
+    pool = redis_pool
+    held = []
     try:
-        yield redis
+        for _ in range(min(connections, settings.REDIS_MAX_CONNECTIONS)):
+            held.append(await pool.get_connection("PING"))
     finally:
-        await redis.close()
+        for connection in held:
+            await pool.release(connection)
+    return len(held)
+
+
+async def close_redis():
+    """Close the shared Redis client and disconnect every pooled connection."""
+    global redis_pool, redis_client, invalidation_bus
+    if invalidation_bus is not None:
+        await invalidation_bus.stop()
+    if redis_client is not None:
+        await redis_client.close()
+        await redis_pool.disconnect()
+    invalidation_bus = None
+    redis_client = None
+    redis_pool = None
+
+
+async def get_redis_client() -> Redis:
+    if redis_client is None:
+        await init_redis()
+    return redis_client
+
+
+def build_cache_repository(redis: Redis) -> CacheRepository:
+    """Return the cache adapter for a request: L1 in front of Redis when enabled."""
+    repository = RedisCacheRepository(redis, cache_codec)
+    if not settings.CACHE_L1_ENABLED:
+        return repository
+    publish = invalidation_bus.publish if invalidation_bus is not None else None
+    return TieredCacheRepository(repository, local_cache, publish, cache_codec)
+
+
+def get_cache_stats() -> dict:
+    return local_cache.stats()
+
+
+def get_redis_pool_stats() -> dict:
+    if redis_pool is None:
+        return {"max_connections": settings.REDIS_MAX_CONNECTIONS, "in_use": 0, "idle": 0, "waiters": 0}
+    return redis_pool.stats()
+
+
+# Dependency để cung cấp Redis client
+async def get_redis_dependency() -> AsyncGenerator[Redis, None]:
+    yield await get_redis_client()
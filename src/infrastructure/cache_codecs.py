@@ -0,0 +1,291 @@
+import json
+import struct
+import zlib
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.domain.models import Product, User
+from src.domain.ports.repositories import CacheCodec
+
+
+# Leading byte of a binary entry. Values below _MAX_VERSION are reserved for codec
+# versions; JSON text never starts with one, so JSON entries are told apart.
+CODEC_VERSION = 1
+_MAX_VERSION = 0x09
+
+
+class JsonCacheCodec(CacheCodec):
+    """JSON text, the format used before codecs existed; datetimes come back as ISO 8601 strings."""
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return json.dumps(value, default=_json_default).encode()
+
+    def decode(self, data: bytes) -> Optional[Any]:
+        # Binary entries (from workers already on that codec) and anything else
+        # that is not JSON are misses, never raw text handed to the services
+        if not data or data[0] < _MAX_VERSION:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+
+def _json_default(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+_COMPRESSED = 0x01
+
+_HEADER = struct.Struct("!BB")
+_INT = struct.Struct("!q")
+_FLOAT = struct.Struct("!d")
+_LENGTH = struct.Struct("!I")
+_SHAPE = struct.Struct("!H")
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_INT_MIN, _INT_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# Domain records are stored as their field values in declaration order, without
+# names. The record header carries a hash of the field names, so an entry written
+# for another shape of the model (a release that added, removed or reordered
+# fields) decodes as a miss instead of filling the wrong fields.
+_RECORDS: Dict[bytes, type] = {b"P": Product, b"U": User}
+
+
+class BinaryCacheCodec(CacheCodec):
+    """
+    Compact tagged binary format with native datetimes and domain records.
+
+    An entry is a version byte, a flags byte and the payload. Payloads of at
+    least ``compress_min_bytes`` are zlib-compressed when that makes them
+    smaller. An entry written by another codec version decodes as a miss, so
+    workers on different releases during a rolling deploy only cost each other
+    cache hits; JSON entries written before this codec are still read.
+    """
+
+    def __init__(self, compress_min_bytes: int = 1024, compress_level: int = 1):
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+        self._legacy = JsonCacheCodec()
+
+    def encode(self, value: Any) -> bytes:
+        parts: List[bytes] = []
+        _encode_value(value, parts)
+        payload = b"".join(parts)
+        flags = 0
+        if len(payload) >= self.compress_min_bytes:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload, flags = compressed, _COMPRESSED
+        return _HEADER.pack(CODEC_VERSION, flags) + payload
+
+    def decode(self, data: bytes) -> Optional[Any]:
+        if not data:
+            return None
+        version = data[0]
+        if version >= _MAX_VERSION:
+            return self._legacy.decode(data)
+        if version != CODEC_VERSION or len(data) < _HEADER.size:
+            return None
+        try:
+            payload = data[_HEADER.size:]
+            if data[1] & _COMPRESSED:
+                payload = zlib.decompress(payload)
+            value, end = _decode_value(payload, 0)
+        except (ValueError, TypeError, IndexError, struct.error, zlib.error):
+            # Corrupt or from an incompatible release: reload from the source
+            return None
+        return value if end == len(payload) else None
+
+
+def _encode_value(value: Any, parts: List[bytes]):
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        raise TypeError(f"Cannot encode {type(value).__name__} for the cache")
+    encoder(value, parts)
+
+
+def _encode_int(value: int, parts: List[bytes]):
+    if _INT_MIN <= value <= _INT_MAX:
+        parts.append(b"i" + _INT.pack(value))
+    else:
+        raw = str(value).encode()
+        parts.append(b"n" + _LENGTH.pack(len(raw)))
+        parts.append(raw)
+
+
+def _encode_str(value: str, parts: List[bytes]):
+    raw = value.encode()
+    parts.append(b"s" + _LENGTH.pack(len(raw)))
+    parts.append(raw)
+
+
+def _encode_bytes(value: bytes, parts: List[bytes]):
+    parts.append(b"b" + _LENGTH.pack(len(value)))
+    parts.append(bytes(value))
+
+
+def _encode_datetime(value: datetime, parts: List[bytes]):
+    # Aware values keep the instant (as UTC), not the original offset
+    if value.tzinfo is None:
+        parts.append(b"d" + _INT.pack((value - _EPOCH) // _MICROSECOND))
+    else:
+        parts.append(b"D" + _INT.pack((value - _EPOCH_UTC) // _MICROSECOND))
+
+
+def _encode_list(value: list, parts: List[bytes]):
+    parts.append(b"l" + _LENGTH.pack(len(value)))
+    for item in value:
+        _encode_value(item, parts)
+
+
+def _encode_dict(value: dict, parts: List[bytes]):
+    parts.append(b"m" + _LENGTH.pack(len(value)))
+    for key, item in value.items():
+        _encode_value(key, parts)
+        _encode_value(item, parts)
+
+
+def _record_layout(record_type: type) -> Tuple[List[str], bytes]:
+    """Field names of a record and the two-byte hash of them stored in its header."""
+    names = [field.name for field in fields(record_type)]
+    return names, _SHAPE.pack(zlib.crc32(",".join(names).encode()) & 0xFFFF)
+
+
+def _record_encoder(tag: bytes, record_type: type) -> Callable[[Any, List[bytes]], None]:
+    names, shape = _record_layout(record_type)
+    values_of = attrgetter(*names)
+    header = tag + shape
+
+    def encode(value: Any, parts: List[bytes]):
+        parts.append(header)
+        for item in values_of(value):
+            _encode_value(item, parts)
+
+    return encode
+
+
+_ENCODERS: Dict[type, Callable[[Any, List[bytes]], None]] = {
+    type(None): lambda value, parts: parts.append(b"N"),
+    bool: lambda value, parts: parts.append(b"T" if value else b"F"),
+    int: _encode_int,
+    float: lambda value, parts: parts.append(b"f" + _FLOAT.pack(value)),
+    str: _encode_str,
+    bytes: _encode_bytes,
+    datetime: _encode_datetime,
+    list: _encode_list,
+    tuple: _encode_list,
+    dict: _encode_dict,
+}
+_ENCODERS.update({record_type: _record_encoder(tag, record_type) for tag, record_type in _RECORDS.items()})
+
+
+def _decode_value(data: bytes, offset: int) -> Tuple[Any, int]:
+    return _DECODERS[data[offset]](data, offset + 1)
+
+
+def _decode_sized(data: bytes, offset: int) -> Tuple[bytes, int]:
+    start = offset + _LENGTH.size
+    end = start + _LENGTH.unpack_from(data, offset)[0]
+    return data[start:end], end
+
+
+def _decode_int(data: bytes, offset: int) -> Tuple[int, int]:
+    return _INT.unpack_from(data, offset)[0], offset + _INT.size
+
+
+def _decode_big_int(data: bytes, offset: int) -> Tuple[int, int]:
+    raw, offset = _decode_sized(data, offset)
+    return int(raw), offset
+
+
+def _decode_float(data: bytes, offset: int) -> Tuple[float, int]:
+    return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+
+
+def _decode_str(data: bytes, offset: int) -> Tuple[str, int]:
+    start = offset + _LENGTH.size
+    end = start + _LENGTH.unpack_from(data, offset)[0]
+    return data[start:end].decode(), end
+
+
+def _decode_datetime(data: bytes, offset: int) -> Tuple[datetime, int]:
+    return _EPOCH + timedelta(microseconds=_INT.unpack_from(data, offset)[0]), offset + _INT.size
+
+
+def _decode_aware_datetime(data: bytes, offset: int) -> Tuple[datetime, int]:
+    return _EPOCH_UTC + timedelta(microseconds=_INT.unpack_from(data, offset)[0]), offset + _INT.size
+
+
+def _decode_list(data: bytes, offset: int) -> Tuple[list, int]:
+    (count,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    decoders = _DECODERS
+    items = []
+    for _ in range(count):
+        item, offset = decoders[data[offset]](data, offset + 1)
+        items.append(item)
+    return items, offset
+
+
+def _decode_dict(data: bytes, offset: int) -> Tuple[dict, int]:
+    (count,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    decoders = _DECODERS
+    result = {}
+    for _ in range(count):
+        key, offset = decoders[data[offset]](data, offset + 1)
+        result[key], offset = decoders[data[offset]](data, offset + 1)
+    return result, offset
+
+
+def _record_decoder(record_type: type) -> Callable[[bytes, int], Tuple[Any, int]]:
+    names, shape = _record_layout(record_type)
+    count = len(names)
+
+    def decode(data: bytes, offset: int) -> Tuple[Any, int]:
+        if data[offset:offset + _SHAPE.size] != shape:
+            raise ValueError(f"Cached {record_type.__name__} has different fields")
+        offset += _SHAPE.size
+        decoders = _DECODERS
+        values = []
+        for _ in range(count):
+            value, offset = decoders[data[offset]](data, offset + 1)
+            values.append(value)
+        return record_type(*values), offset
+
+    return decode
+
+
+def _unknown_tag(data: bytes, offset: int):
+    raise ValueError(f"Unknown cache entry tag {data[offset - 1]:#x}")
+
+
+# Indexed by tag byte
+_DECODERS: List[Callable[[bytes, int], Tuple[Any, int]]] = [_unknown_tag] * 256
+for _tag, _decoder in {
+    b"N": lambda data, offset: (None, offset),
+    b"T": lambda data, offset: (True, offset),
+    b"F": lambda data, offset: (False, offset),
+    b"i": _decode_int,
+    b"n": _decode_big_int,
+    b"f": _decode_float,
+    b"s": _decode_str,
+    b"b": _decode_sized,
+    b"d": _decode_datetime,
+    b"D": _decode_aware_datetime,
+    b"l": _decode_list,
+    b"m": _decode_dict,
+    **{tag: _record_decoder(record_type) for tag, record_type in _RECORDS.items()},
+}.items():
+    _DECODERS[_tag[0]] = _decoder
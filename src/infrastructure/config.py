@@ -1,4 +1,5 @@
 import os
+from typing import List
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -15,11 +16,39 @@ class Settings(BaseSettings):
     MYSQL_USER: str = os.getenv("MYSQL_USER", "root")
     MYSQL_PASSWORD: str = os.getenv("MYSQL_PASSWORD", "password")
     MYSQL_DATABASE: str = os.getenv("MYSQL_DATABASE", "hexagonal_demo")
+
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    # Run CREATE TABLE for missing tables at startup; leave off where migrations own the schema
+    DB_CREATE_SCHEMA: bool = os.getenv("DB_CREATE_SCHEMA", "false").lower() == "true"
+
+    # Startup warm-up; /ready answers 503 until it has finished
+    WARMUP_DB_CONNECTIONS: int = int(os.getenv("WARMUP_DB_CONNECTIONS", "5"))
+    WARMUP_REDIS_CONNECTIONS: int = int(os.getenv("WARMUP_REDIS_CONNECTIONS", "5"))
+    WARMUP_HOT_PRODUCTS: int = int(os.getenv("WARMUP_HOT_PRODUCTS", "100"))
+    WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+    # Per-request SQL instrumentation
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    SQL_QUERY_BUDGET: int = int(os.getenv("SQL_QUERY_BUDGET", "10"))
+    SQL_REPEAT_THRESHOLD: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "3"))
+    SQL_SERVER_TIMING: bool = os.getenv("SQL_SERVER_TIMING", "false").lower() == "true"
     
     # JWT settings
     JWT_SECRET: str = os.getenv("JWT_SECRET", "your-secret-key")
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 60
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "300"))
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "100"))
     
 
     # Redis setting
@@ -27,11 +56,46 @@ class Settings(BaseSettings):
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_POOL_TIMEOUT: float = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2"))
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+    # In-process L1 cache in front of Redis
+    CACHE_L1_ENABLED: bool = os.getenv("CACHE_L1_ENABLED", "true").lower() == "true"
+    CACHE_L1_MAX_ENTRIES: int = int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000"))
+    CACHE_L1_MAX_BYTES: int = int(os.getenv("CACHE_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+    CACHE_L1_TTL: float = float(os.getenv("CACHE_L1_TTL", "30"))
+    CACHE_L1_NEGATIVE_TTL: float = float(os.getenv("CACHE_L1_NEGATIVE_TTL", "5"))
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+    # Format of cached values. Stays "json" for this release: workers from before codecs cannot
+    # read binary entries. Switch to "binary" once every worker sharing the cache runs this one.
+    CACHE_CODEC: str = os.getenv("CACHE_CODEC", "json")
+    CACHE_COMPRESS_MIN_BYTES: int = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+
+    # Sent with product GETs; s-maxage lets a CDN answer repeat polls, clients revalidate with ETags
+    PRODUCT_CACHE_CONTROL: str = os.getenv("PRODUCT_CACHE_CONTROL", "public, max-age=0, s-maxage=10, must-revalidate")
+
+    # Encoded product responses cached as ready-to-send bytes; bodies above the threshold are kept gzipped
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_GZIP_MIN_BYTES: int = int(os.getenv("RESPONSE_CACHE_GZIP_MIN_BYTES", "2048"))
+
+    # Read replicas: comma-separated SQLAlchemy URLs, empty to send all reads to the primary
+    MYSQL_REPLICA_URLS: str = os.getenv("MYSQL_REPLICA_URLS", "")
+    REPLICA_RETRY_SECONDS: int = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
 
     # Database URL construction
     @property
     def DATABASE_URL(self) -> str:
         return f"mysql+aiomysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
 
+    @property
+    def REPLICA_DATABASE_URLS(self) -> List[str]:
+        return [url.strip() for url in self.MYSQL_REPLICA_URLS.split(",") if url.strip()]
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,25 +1,96 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Set
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
 
 from src.infrastructure.config import settings
+from src.infrastructure.metrics import instrument_statements
+from src.infrastructure.query_tracking import track_queries
+from src.infrastructure.pool_telemetry import TimedQueuePool, instrument_engine, pool_telemetry
+
+
+def create_engine(url: str, name: str) -> AsyncEngine:
+    engine = instrument_engine(
+        create_async_engine(
+            url,
+            echo=settings.DB_ECHO,  # Query logging is synchronous; keep it off in production
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_logging_name=name,
+        ),
+        name,
+    )
+    return track_queries(instrument_statements(engine, name))
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Set to True for SQLAlchemy to echo queries
-    pool_pre_ping=True,   # Enables the connection pool "pre-ping" feature
-)
+engine = create_engine(settings.DATABASE_URL, "primary")
 
 # Create async session factory
 async_session_factory = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Read replicas share one session factory; each session is bound to the chosen replica
+replica_engines: List[AsyncEngine] = [
+    create_engine(url, f"replica-{index}")
+    for index, url in enumerate(settings.REPLICA_DATABASE_URLS)
+]
+read_session_factory = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+# Cookie set after a successful write so the same client reads from the primary for a while
+PRIMARY_STICKY_COOKIE = "db_primary"
+
+logger = logging.getLogger(__name__)
+
 # Create a base class for declarative models
 Base = declarative_base()
 
+# Running after-commit callbacks, referenced until they finish
+_commit_tasks: Set[asyncio.Task] = set()
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], Awaitable]):
+    """
+    Run ``callback()`` in the background once the session's transaction commits.
+
+    get_db commits after the response has been sent, so work that must not be
+    visible before the data is (cache invalidation, version bumps) goes here.
+    Callbacks are dropped if the transaction rolls back.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _start_commit_callbacks(session: Session):
+    for callback in session.info.pop("after_commit", []):
+        task = asyncio.get_running_loop().create_task(callback())
+        _commit_tasks.add(task)
+        task.add_done_callback(_commit_callback_done)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_commit_callbacks(session: Session):
+    session.info.pop("after_commit", None)
+
+
+def _commit_callback_done(task: asyncio.Task):
+    _commit_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("After-commit callback failed: %s", task.exception())
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -37,6 +108,69 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+class ReplicaSelector:
+    """Round-robin over replicas, skipping any that recently failed to connect."""
+
+    def __init__(self, engines: List[AsyncEngine], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[int, float] = {}
+        self._counter = itertools.count()
+
+    def candidates(self) -> List[AsyncEngine]:
+        if not self.engines:
+            return []
+        start = next(self._counter) % len(self.engines)
+        ordered = self.engines[start:] + self.engines[:start]
+        now = time.monotonic()
+        return [engine for engine in ordered if self._down_until.get(id(engine), 0) <= now]
+
+    def mark_down(self, engine: AsyncEngine):
+        self._down_until[id(engine)] = time.monotonic() + self.retry_seconds
+
+
+replica_selector = ReplicaSelector(replica_engines, settings.REPLICA_RETRY_SECONDS)
+
+
+async def open_replica_session() -> Optional[AsyncSession]:
+    """Open a session on the next healthy replica, or None if every replica is unavailable."""
+    for replica in replica_selector.candidates():
+        session = read_session_factory(bind=replica)
+        try:
+            # Connect eagerly so a dead replica is detected here and not mid-query
+            await session.connection()
+            return session
+        except (DBAPIError, OSError) as e:
+            logger.warning("Read replica %s unavailable: %s", replica.url.host, e)
+            await session.close()
+            replica_selector.mark_down(replica)
+    return None
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provides a session for read-only queries.
+    
+    Safe requests go to a replica unless the client wrote recently (read-your-writes);
+    everything else, and any request when no replica is reachable, shares the primary session.
+    """
+    if (
+        not replica_engines
+        or request.method not in ("GET", "HEAD")
+        or request.cookies.get(PRIMARY_STICKY_COOKIE)
+    ):
+        yield db
+        return
+    
+    session = await open_replica_session()
+    if session is None:
+        yield db
+        return
+    
+    async with session:
+        yield session
+
+
 async def init_db():
     """Initialize the database with tables."""
     async with engine.begin() as conn:
@@ -46,3 +180,48 @@ async def init_db():
         
         # Create tables
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_up_db(connections: int) -> int:
+    """
+    Open up to ``connections`` pooled connections on the primary and each replica
+    so the first requests skip the connection handshake. Returns how many were opened.
+    """
+    count = min(connections, settings.DB_POOL_SIZE)
+    opened = await _open_connections(engine, count)
+    for replica in replica_engines:
+        try:
+            opened += await _open_connections(replica, count)
+        except DBAPIError as e:
+            # Reads fall back to the primary, so a missing replica must not hold up readiness
+            logger.warning("Read replica %s unavailable during warm-up: %s", replica.url.host, e)
+    return opened
+
+
+async def _open_connections(pool_engine: AsyncEngine, count: int) -> int:
+    # Hold every connection at once so the pool has to create each of them
+    held = []
+    try:
+        for _ in range(count):
+            held.append(await pool_engine.connect())
+    finally:
+        for connection in held:
+            await connection.close()
+    return len(held)
+
+
+def get_db_pool_stats() -> dict:
+    engines = {"primary": engine}
+    engines.update({f"replica-{index}": replica for index, replica in enumerate(replica_engines)})
+    return {
+        name: pool_telemetry[name].stats(pool_engine)
+        for name, pool_engine in engines.items()
+        if name in pool_telemetry
+    }
+
+
+async def close_db():
+    """Dispose of the primary and replica connection pools."""
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
@@ -0,0 +1,166 @@
+import os
+import time
+from typing import Dict, List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.domain.ports.services import MetricsRecorder
+
+# With several workers, set PROMETHEUS_MULTIPROC_DIR to a shared, empty directory
+# before startup; each process then writes its samples there and /metrics merges them.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+DB_LATENCY = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time",
+    ["engine", "operation"], buckets=LATENCY_BUCKETS,
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds", "Redis command latency seen by the cache repository",
+    ["command"], buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Application cache lookups by result",
+    ["cache", "result"],
+)
+STOCK_UPDATES = Counter(
+    "stock_updates_total", "Stock reservation and release attempts by outcome",
+    ["outcome"],
+)
+
+# Label children are resolved once and reused so the hot path does no label lookups
+_children: Dict[Tuple, object] = {}
+
+
+def _child(metric, *labels):
+    key = (id(metric), labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    _child(REQUEST_LATENCY, method, route).observe(seconds)
+    _child(REQUESTS, method, route, str(status)).inc()
+
+
+def observe_redis(command: str, started: float):
+    _child(REDIS_LATENCY, command).observe(time.perf_counter() - started)
+
+
+_SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def instrument_statements(engine: AsyncEngine, name: str) -> AsyncEngine:
+    sync_engine = engine.sync_engine
+
+    # Start times are keyed by execution context, so a statement is always
+    # matched with its own start
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", {})[id(context)] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop(id(context))
+        operation = statement.lstrip()[:6].upper()
+        if operation not in _SQL_OPERATIONS:
+            operation = "OTHER"
+        _child(DB_LATENCY, name, operation).observe(elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        conn = context.connection
+        if conn is not None and "query_started" in conn.info:
+            conn.info["query_started"].pop(id(context.execution_context), None)
+
+    return engine
+
+
+class StockContentionTracker:
+    """
+    Per-product stock update outcomes, for finding the SKUs that are fought over.
+
+    Product ids would explode Prometheus label cardinality, so they are counted
+    here instead (per process). At most ``max_products`` are tracked; when full,
+    the least contended half is dropped.
+    """
+
+    CONTENDED = ("retried", "aborted", "insufficient")
+
+    def __init__(self, max_products: int = 10000):
+        self.max_products = max_products
+        self._counts: Dict[int, Dict[str, int]] = {}
+
+    def record(self, product_id: int, outcome: str):
+        counts = self._counts.get(product_id)
+        if counts is None:
+            if len(self._counts) >= self.max_products:
+                self._trim()
+            counts = self._counts[product_id] = {}
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    def hottest(self, limit: int = 20) -> List[dict]:
+        ranked = sorted(self._counts.items(), key=lambda item: self._rank(item[1]), reverse=True)
+        return [
+            {"product_id": product_id, "contention": self._rank(counts)[0], **counts}
+            for product_id, counts in ranked[:limit]
+        ]
+
+    def _trim(self):
+        ranked = sorted(self._counts, key=lambda product_id: self._rank(self._counts[product_id]), reverse=True)
+        for product_id in ranked[self.max_products // 2:]:
+            del self._counts[product_id]
+
+    def _rank(self, counts: Dict[str, int]) -> Tuple[int, int]:
+        return sum(counts.get(outcome, 0) for outcome in self.CONTENDED), sum(counts.values())
+
+
+stock_contention = StockContentionTracker()
+
+
+class PrometheusMetricsRecorder(MetricsRecorder):
+    def record_cache_lookup(self, cache: str, hit: bool) -> None:
+        _child(CACHE_LOOKUPS, cache, "hit" if hit else "miss").inc()
+
+    def record_stock_update(self, product_id: int, outcome: str) -> None:
+        _child(STOCK_UPDATES, outcome).inc()
+        stock_contention.record(product_id, outcome)
+
+
+metrics_recorder = PrometheusMetricsRecorder()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
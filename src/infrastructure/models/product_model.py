@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Index, func
 from src.infrastructure.database import Base
 
 
@@ -11,4 +11,15 @@ class ProductModel(Base):
     price = Column(Float, nullable=False)
     stock = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Serve the price and newest sorts of /products/search. Keyset pages of
+        # /products walk the primary key and filter price/stock row by row: an
+        # index led by price or stock cannot produce ORDER BY id without a filesort.
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Other dialects get an ordinary index; search falls back to LIKE there
+        Index("ix_products_fulltext", "name", "description", mysql_prefix="FULLTEXT"),
+    )
\ No newline at end of file
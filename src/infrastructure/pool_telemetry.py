@@ -0,0 +1,88 @@
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolTelemetry:
+    """Counters for one engine's connection pool, fed by SQLAlchemy pool events."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.checkout_wait_total += seconds
+        if seconds > self.checkout_wait_max:
+            self.checkout_wait_max = seconds
+
+    def attach(self, engine: AsyncEngine):
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        @event.listens_for(sync_engine, "close")
+        def on_close(dbapi_connection, connection_record):
+            self.closes += 1
+
+        @event.listens_for(sync_engine, "close_detached")
+        def on_close_detached(dbapi_connection):
+            self.closes += 1
+
+        @event.listens_for(sync_engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+
+    def stats(self, engine: AsyncEngine) -> dict:
+        pool = engine.sync_engine.pool
+        stats = {
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": round(self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+            "connects": self.connects,
+            "closes": self.closes,
+            "invalidations": self.invalidations,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # Negative while the pool is still below its base size
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return stats
+
+
+# One entry per pool, keyed by the engine's pool_logging_name
+pool_telemetry: Dict[str, PoolTelemetry] = {}
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            telemetry = pool_telemetry.get(self._orig_logging_name)
+            if telemetry is not None:
+                telemetry.record_wait(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> AsyncEngine:
+    telemetry = pool_telemetry[name] = PoolTelemetry(name)
+    telemetry.attach(engine)
+    return engine
@@ -0,0 +1,92 @@
+import contextvars
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """SQL statements issued while serving one request."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Dict[str, int] = {}
+
+    @property
+    def label(self) -> str:
+        # The router stores the matched route in the scope once routing is done
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+
+        # Parameters are bound separately, so the statement text is already its shape
+        repeats = self.shapes.get(statement, 0) + 1
+        self.shapes[statement] = repeats
+        if repeats == settings.SQL_REPEAT_THRESHOLD:
+            logger.warning(
+                "Possible N+1: statement ran %d times in %s: %s",
+                repeats, self.label, _shorten(statement),
+            )
+
+        if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                elapsed * 1000, self.label, _shorten(statement),
+            )
+
+    def finish(self):
+        if self.count > settings.SQL_QUERY_BUDGET:
+            logger.warning(
+                "Query budget exceeded in %s: %d statements (budget %d), %.1f ms in the database",
+                self.label, self.count, settings.SQL_QUERY_BUDGET, self.duration * 1000,
+            )
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+current_query_stats: contextvars.ContextVar[Optional[RequestQueryStats]] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _shorten(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def track_queries(engine: AsyncEngine) -> AsyncEngine:
+    """Attribute every statement run on this engine to the request being served."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_query_stats.get() is not None:
+            conn.info.setdefault("tracking_started", {})[id(context)] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = current_query_stats.get()
+        started = conn.info.get("tracking_started", {}).pop(id(context), None)
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        # Failed statements never reach after_cursor_execute
+        conn = context.connection
+        if conn is not None and "tracking_started" in conn.info:
+            conn.info["tracking_started"].pop(id(context.execution_context), None)
+
+    return engine
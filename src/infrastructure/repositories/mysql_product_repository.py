@@ -1,51 +1,143 @@
-from typing import List, Optional
-from sqlalchemy import select, delete
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import select, delete, insert, lambda_stmt, update, case, literal
+from sqlalchemy.dialects.mysql import insert as mysql_insert, match
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domain.exceptions import ProductVersionConflict, StockContention
 from src.domain.models import Product
 from src.domain.ports.repositories import ProductRepository
+from src.infrastructure.database import run_after_commit
 from src.infrastructure.models.product_model import ProductModel
 
+# Reads select plain columns in Product field order and build domain objects
+# straight from the rows, so nothing is loaded into the session identity map.
+# The statements are lambda_stmt()s, whose compiled SQL is cached by code location.
+PRODUCT_COLUMNS = (
+    ProductModel.id,
+    ProductModel.name,
+    ProductModel.description,
+    ProductModel.price,
+    ProductModel.stock,
+    ProductModel.created_at,
+    ProductModel.updated_at,
+    ProductModel.version,
+)
+
+# ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK
+LOCK_CONFLICT_ERRORS = (1205, 1213)
+
 
 class MySQLProductRepository(ProductRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.session = session
+        # Reads may go to a replica; writes always use the primary session
+        self.read_session = read_session or session
     
     async def get_all(self) -> List[Product]:
-        query = select(ProductModel)
-        result = await self.session.execute(query)
-        product_models = result.scalars().all()
-        
-        return [
-            Product(
-                id=product.id,
-                name=product.name,
-                description=product.description,
-                price=product.price,
-                stock=product.stock,
-                created_at=product.created_at,
-                updated_at=product.updated_at
-            )
-            for product in product_models
-        ]
+        result = await self.read_session.execute(lambda_stmt(lambda: select(*PRODUCT_COLUMNS)))
+        return [Product(*row) for row in result]
     
-    async def get_by_id(self, product_id: int) -> Optional[Product]:
-        query = select(ProductModel).where(ProductModel.id == product_id)
-        result = await self.session.execute(query)
-        product_model = result.scalars().first()
+    async def get_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+    ) -> List[Product]:
+        query = lambda_stmt(lambda: select(*PRODUCT_COLUMNS))
+        if after_id is not None:
+            query += lambda q: q.where(ProductModel.id > after_id)
+        if min_price is not None:
+            query += lambda q: q.where(ProductModel.price >= min_price)
+        if max_price is not None:
+            query += lambda q: q.where(ProductModel.price <= max_price)
+        if in_stock is True:
+            query += lambda q: q.where(ProductModel.stock > 0)
+        elif in_stock is False:
+            query += lambda q: q.where(ProductModel.stock == 0)
+        query += lambda q: q.order_by(ProductModel.id).limit(limit)
+
+        result = await self.read_session.execute(query)
+        return [Product(*row) for row in result]
+    
+    async def search(
+        self,
+        text: Optional[str],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Product]:
+        query = select(*PRODUCT_COLUMNS)
+        score = None
+        if text:
+            if self.read_session.bind.dialect.name == "mysql":
+                # Natural language mode: no operator syntax to escape, results ranked by relevance
+                score = match(ProductModel.name, ProductModel.description, against=text)
+                query = query.where(score)
+            else:
+                score = self._like_score(text)
+                query = query.where(score > 0)
+        if min_price is not None:
+            query = query.where(ProductModel.price >= min_price)
+        if max_price is not None:
+            query = query.where(ProductModel.price <= max_price)
+        if in_stock is True:
+            query = query.where(ProductModel.stock > 0)
+        elif in_stock is False:
+            query = query.where(ProductModel.stock == 0)
         
-        if not product_model:
-            return None
+        if sort == "price_asc":
+            query = query.order_by(ProductModel.price, ProductModel.id)
+        elif sort == "price_desc":
+            query = query.order_by(ProductModel.price.desc(), ProductModel.id.desc())
+        elif sort == "newest":
+            query = query.order_by(ProductModel.created_at.desc(), ProductModel.id.desc())
+        elif score is not None:
+            query = query.order_by(score.desc(), ProductModel.id)
+        else:
+            query = query.order_by(ProductModel.id)
         
-        return Product(
-            id=product_model.id,
-            name=product_model.name,
-            description=product_model.description,
-            price=product_model.price,
-            stock=product_model.stock,
-            created_at=product_model.created_at,
-            updated_at=product_model.updated_at
+        result = await self.read_session.execute(query.limit(limit).offset(offset))
+        return [Product(*row) for row in result]
+    
+    @staticmethod
+    def _like_score(text: str):
+        """Portable stand-in for MATCH ... AGAINST: name hits weigh twice description hits."""
+        score = literal(0)
+        for term in text.split():
+            score = score + case((ProductModel.name.contains(term, autoescape=True), 2), else_=0)
+            score = score + case((ProductModel.description.contains(term, autoescape=True), 1), else_=0)
+        return score
+    
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[List[Product]]:
+        # Server-side cursor: rows are fetched from MySQL one batch at a time
+        query = (
+            select(*PRODUCT_COLUMNS)
+            .order_by(ProductModel.id)
+            .execution_options(yield_per=batch_size)
         )
+        result = await self.read_session.stream(query)
+        
+        async for rows in result.partitions(batch_size):
+            yield [Product(*row) for row in rows]
+    
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        query = lambda_stmt(lambda: select(*PRODUCT_COLUMNS).where(ProductModel.id == product_id))
+        row = (await self.read_session.execute(query)).first()
+        return Product(*row) if row else None
+    
+    async def get_by_ids(self, product_ids: List[int]) -> List[Product]:
+        if not product_ids:
+            return []
+        
+        query = lambda_stmt(lambda: select(*PRODUCT_COLUMNS).where(ProductModel.id.in_(product_ids)))
+        result = await self.read_session.execute(query)
+        return [Product(*row) for row in result]
     
     async def create(self, product: Product) -> Product:
         product_model = ProductModel(
@@ -61,25 +153,159 @@ class MySQLProductRepository(ProductRepository):
         await self.session.flush()
         
         product.id = product_model.id
+        product.version = product_model.version
         return product
     
     async def update(self, product: Product) -> Product:
-        query = select(ProductModel).where(ProductModel.id == product.id)
+        updated = await self.update_fields(product.id, {
+            "name": product.name,
+            "description": product.description,
+            "price": product.price,
+            "stock": product.stock,
+            "updated_at": product.updated_at,
+        }, product.version)
+        if not updated:
+            raise ProductVersionConflict(product.id)
+        
+        if product.version is not None:
+            product.version += 1
+        return product
+    
+    async def update_fields(
+        self,
+        product_id: int,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        query = update(ProductModel).where(ProductModel.id == product_id)
+        if expected_version is not None:
+            query = query.where(ProductModel.version == expected_version)
+        query = query.values(**changes, version=ProductModel.version + 1).execution_options(
+            synchronize_session=False
+        )
         result = await self.session.execute(query)
-        product_model = result.scalars().first()
+        # The MySQL dialects connect with CLIENT_FOUND_ROWS, so an UPDATE that
+        # leaves every value unchanged still counts its matched row
+        return result.rowcount > 0
+    
+    async def reserve_stock(self, quantities: Dict[int, int]) -> List[int]:
+        applied = []
+        # Rows are always locked in id order so two multi-item reservations
+        # cannot deadlock on each other
+        for product_id in sorted(quantities):
+            if not await self._adjust_stock(product_id, -quantities[product_id]):
+                # Give back what this call already took; the failing row was never changed
+                for taken_id in applied:
+                    await self._adjust_stock(taken_id, quantities[taken_id])
+                return [product_id]
+            applied.append(product_id)
+        return []
+    
+    async def release_stock(self, quantities: Dict[int, int]) -> List[int]:
+        applied = []
+        for product_id in sorted(quantities):
+            if not await self._adjust_stock(product_id, quantities[product_id]):
+                for returned_id in applied:
+                    await self._adjust_stock(returned_id, -quantities[returned_id])
+                return [product_id]
+            applied.append(product_id)
+        return []
+    
+    async def _adjust_stock(self, product_id: int, delta: int) -> bool:
+        """Conditional in-place stock change: never reads the row, never goes below zero."""
+        query = update(ProductModel).where(ProductModel.id == product_id)
+        if delta < 0:
+            query = query.where(ProductModel.stock >= -delta)
+        query = query.values(
+            stock=ProductModel.stock + delta,
+            version=ProductModel.version + 1,
+        ).execution_options(synchronize_session=False)
         
-        if product_model:
-            product_model.name = product.name
-            product_model.description = product.description
-            product_model.price = product.price
-            product_model.stock = product.stock
-            product_model.updated_at = product.updated_at
+        try:
+            result = await self.session.execute(query)
+        except OperationalError as exc:
+            if not self._is_lock_conflict(exc):
+                raise
+            # The transaction is unusable (MySQL already rolled back a deadlock victim)
+            await self.session.rollback()
+            raise StockContention(product_id) from exc
+        return result.rowcount > 0
+    
+    @staticmethod
+    def _is_lock_conflict(exc: OperationalError) -> bool:
+        args = getattr(exc.orig, "args", ())
+        return bool(args) and args[0] in LOCK_CONFLICT_ERRORS
+    
+    async def bulk_upsert(self, products: List[Product], chunk_size: int = 500) -> List[bool]:
+        created_flags = []
+        
+        for start in range(0, len(products), chunk_size):
+            chunk = products[start:start + chunk_size]
+            with_id = [product for product in chunk if product.id is not None]
+            without_id = [product for product in chunk if product.id is None]
+            
+            created = {}
+            if with_id:
+                stmt = mysql_insert(ProductModel).values([
+                    {
+                        "id": product.id,
+                        "name": product.name,
+                        "description": product.description,
+                        "price": product.price,
+                        "stock": product.stock,
+                        "created_at": product.created_at,
+                        "updated_at": product.updated_at,
+                    }
+                    for product in with_id
+                ])
+                stmt = stmt.on_duplicate_key_update(
+                    name=stmt.inserted.name,
+                    description=stmt.inserted.description,
+                    price=stmt.inserted.price,
+                    stock=stmt.inserted.stock,
+                    updated_at=stmt.inserted.updated_at,
+                    version=ProductModel.version + 1,
+                )
+                await self.session.execute(stmt)
+                
+                # Read back after the upsert, which holds the row locks: a row this
+                # statement inserted is at version 1, an updated one has been bumped
+                query = select(ProductModel.id, ProductModel.version, ProductModel.created_at).where(
+                    ProductModel.id.in_([product.id for product in with_id])
+                )
+                stored = {row.id: row for row in await self.session.execute(query)}
+                for product in with_id:
+                    row = stored[product.id]
+                    product.version = row.version
+                    product.created_at = row.created_at
+                    created[product.id] = row.version == 1
             
-            await self.session.flush()
+            # One INSERT per new row: the ids of a multi-row INSERT are not reliably
+            # consecutive (auto_increment_increment, innodb_autoinc_lock_mode=2), and
+            # SQLite reports the last id rather than the first
+            for product in without_id:
+                result = await self.session.execute(
+                    insert(ProductModel).values(
+                        name=product.name,
+                        description=product.description,
+                        price=product.price,
+                        stock=product.stock,
+                        created_at=product.created_at,
+                        updated_at=product.updated_at,
+                    )
+                )
+                product.id = result.lastrowid
+                product.version = 1
+                created[product.id] = True
+            
+            created_flags.extend(created[product.id] for product in chunk)
         
-        return product
+        return created_flags
     
     async def delete(self, product_id: int) -> bool:
         query = delete(ProductModel).where(ProductModel.id == product_id)
         result = await self.session.execute(query)
-        return result.rowcount > 0
\ No newline at end of file
+        return result.rowcount > 0
+    
+    def on_commit(self, callback: Callable[[], Awaitable]) -> None:
+        run_after_commit(self.session, callback)
@@ -1,66 +1,43 @@
-from typing import List, Optional
-from sqlalchemy import select, delete
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy import select, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.models import User
 from src.domain.ports.repositories import UserRepository
+from src.infrastructure.database import run_after_commit
 from src.infrastructure.models.user_model import UserModel
 
+# Plain columns in User field order; see MySQLProductRepository
+USER_COLUMNS = (
+    UserModel.id,
+    UserModel.username,
+    UserModel.email,
+    UserModel.hashed_password,
+    UserModel.created_at,
+    UserModel.updated_at,
+)
+
 
 class MySQLUserRepository(UserRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.session = session
+        # Reads may go to a replica; writes and uniqueness checks use the primary
+        self.read_session = read_session or session
     
     async def get_by_id(self, user_id: int) -> Optional[User]:
-        query = select(UserModel).where(UserModel.id == user_id)
-        result = await self.session.execute(query)
-        user_model = result.scalars().first()
-        
-        if not user_model:
-            return None
-        
-        return User(
-            id=user_model.id,
-            username=user_model.username,
-            email=user_model.email,
-            hashed_password=user_model.hashed_password,
-            created_at=user_model.created_at,
-            updated_at=user_model.updated_at
-        )
+        query = lambda_stmt(lambda: select(*USER_COLUMNS).where(UserModel.id == user_id))
+        row = (await self.read_session.execute(query)).first()
+        return User(*row) if row else None
     
     async def get_by_email(self, email: str) -> Optional[User]:
-        query = select(UserModel).where(UserModel.email == email)
-        result = await self.session.execute(query)
-        user_model = result.scalars().first()
-        
-        if not user_model:
-            return None
-        
-        return User(
-            id=user_model.id,
-            username=user_model.username,
-            email=user_model.email,
-            hashed_password=user_model.hashed_password,
-            created_at=user_model.created_at,
-            updated_at=user_model.updated_at
-        )
+        query = lambda_stmt(lambda: select(*USER_COLUMNS).where(UserModel.email == email))
+        row = (await self.read_session.execute(query)).first()
+        return User(*row) if row else None
     
     async def get_by_username(self, username: str) -> Optional[User]:
-        query = select(UserModel).where(UserModel.username == username)
-        result = await self.session.execute(query)
-        user_model = result.scalars().first()
-        
-        if not user_model:
-            return None
-        
-        return User(
-            id=user_model.id,
-            username=user_model.username,
-            email=user_model.email,
-            hashed_password=user_model.hashed_password,
-            created_at=user_model.created_at,
-            updated_at=user_model.updated_at
-        )
+        query = lambda_stmt(lambda: select(*USER_COLUMNS).where(UserModel.username == username))
+        row = (await self.session.execute(query)).first()
+        return User(*row) if row else None
     
     async def create(self, user: User) -> User:
         user_model = UserModel(
@@ -97,3 +74,6 @@ class MySQLUserRepository(UserRepository):
         query = delete(UserModel).where(UserModel.id == user_id)
         result = await self.session.execute(query)
         return result.rowcount > 0
+    
+    def on_commit(self, callback: Callable[[], Awaitable]) -> None:
+        run_after_commit(self.session, callback)
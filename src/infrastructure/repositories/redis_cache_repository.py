@@ -1,36 +1,225 @@
-import json
-from typing import Any, Optional
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from redis.asyncio import Redis
-from src.domain.ports.repositories import CacheRepository
+from redis.asyncio.client import Pipeline
+from redis.client import NEVER_DECODE
+from src.domain.ports.repositories import CacheCodec, CachePipeline, CacheRepository
+from src.domain.ports.repositories.cache_repository import expiry_for
+from src.infrastructure.cache_codecs import JsonCacheCodec
+from src.infrastructure.metrics import observe_redis
+
+# Delete the lock only if it still holds our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# INCRBY that starts a missing counter from ARGV[2] and refreshes its TTL (ARGV[3], 0 = none)
+SEEDED_INCREMENT_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 0 then
+    redis.call("set", KEYS[1], ARGV[2])
+end
+local value = redis.call("incrby", KEYS[1], ARGV[1])
+if tonumber(ARGV[3]) > 0 then
+    redis.call("expire", KEYS[1], ARGV[3])
+end
+return value
+"""
+
+
+class RedisCachePipeline(CachePipeline):
+    def __init__(self, pipe: Pipeline, codec: CacheCodec):
+        self.pipe = pipe
+        self.codec = codec
+        self.queued = 0
+        self._results: List[Any] = []
+    
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        if expire:
+            self.pipe.setex(key, expire, self.codec.encode(value))
+        else:
+            self.pipe.set(key, self.codec.encode(value))
+        self.queued += 1
+    
+    def delete(self, *keys: str):
+        if keys:
+            self.pipe.delete(*keys)
+            self.queued += 1
+    
+    def increment(self, key: str, amount: int = 1, initial: int = 0, expire: Optional[int] = None):
+        if initial or expire:
+            self.pipe.eval(SEEDED_INCREMENT_SCRIPT, 1, key, amount, initial, expire or 0)
+        else:
+            self.pipe.incrby(key, amount)
+        self.queued += 1
+    
+    def expire(self, key: str, seconds: int):
+        self.pipe.expire(key, seconds)
+        self.queued += 1
+    
+    @property
+    def results(self) -> List[Any]:
+        return self._results
+
 
 class RedisCacheRepository(CacheRepository):
-    def __init__(self, redis_client: Redis):
+    def __init__(self, redis_client: Redis, codec: Optional[CacheCodec] = None):
         self.redis = redis_client
+        self.codec = codec or JsonCacheCodec()
     
     async def get(self, key: str) -> Optional[Any]:
-        data = await self.redis.get(key)
-        if data:
-            try:
-                return json.loads(data)
-            except json.JSONDecodeError:
-                return data
-        return None
+        started = time.perf_counter()
+        # The shared pool decodes replies to str; encoded values must bypass that
+        data = await self.redis.execute_command("GET", key, **{NEVER_DECODE: True})
+        observe_redis("get", started)
+        return self._decode(data)
     
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         try:
-            if not isinstance(value, (str, bytes)):
-                value = json.dumps(value)
+            value = self._encode(value)
             
+            started = time.perf_counter()
+            if expire:
+                result = await self.redis.setex(key, expire, value)
+                observe_redis("setex", started)
+            else:
+                result = await self.redis.set(key, value)
+                observe_redis("set", started)
+            return result
+        except Exception:
+            return False
+    
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        started = time.perf_counter()
+        data = await self.redis.execute_command("GET", key, **{NEVER_DECODE: True})
+        observe_redis("get", started)
+        return data
+    
+    async def set_bytes(self, key: str, value: bytes, expire: Optional[int] = None) -> bool:
+        try:
+            started = time.perf_counter()
             if expire:
-                return await self.redis.setex(key, expire, value)
+                result = await self.redis.setex(key, expire, value)
+                observe_redis("setex", started)
             else:
-                return await self.redis.set(key, value)
+                result = await self.redis.set(key, value)
+                observe_redis("set", started)
+            return bool(result)
+        except Exception:
+            return False
+    
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        started = time.perf_counter()
+        values = await self.redis.execute_command("MGET", *keys, **{NEVER_DECODE: True})
+        observe_redis("mget", started)
+        return [self._decode(data) for data in values]
+    
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        if not items:
+            return True
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, expiry_for(key, expire, jitter))
+            return all(pipe.results)
         except Exception:
             return False
     
     async def delete(self, key: str) -> bool:
-        return bool(await self.redis.delete(key))
+        started = time.perf_counter()
+        result = await self.redis.delete(key)
+        observe_redis("delete", started)
+        return bool(result)
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        if not keys:
+            return 0
+        started = time.perf_counter()
+        result = await self.redis.delete(*keys)
+        observe_redis("delete", started)
+        return result
     
     async def exists(self, key: str) -> bool:
-        return bool(await self.redis.exists(key))
\ No newline at end of file
+        started = time.perf_counter()
+        result = await self.redis.exists(key)
+        observe_redis("exists", started)
+        return bool(result)
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[CachePipeline]:
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            batch = RedisCachePipeline(pipe, self.codec)
+            yield batch
+            if batch.queued:
+                started = time.perf_counter()
+                batch.results.extend(await pipe.execute())
+                observe_redis("pipeline", started)
+    
+    async def increment(self, key: str, amount: int = 1) -> int:
+        started = time.perf_counter()
+        result = await self.redis.incrby(key, amount)
+        observe_redis("incrby", started)
+        return int(result)
+    
+    async def increment_score(self, key: str, member: str, amount: float = 1.0) -> float:
+        started = time.perf_counter()
+        result = await self.redis.zincrby(key, amount, member)
+        observe_redis("zincrby", started)
+        return float(result)
+    
+    async def top_members(self, key: str, count: int) -> List[str]:
+        started = time.perf_counter()
+        result = await self.redis.zrevrange(key, 0, count - 1)
+        observe_redis("zrevrange", started)
+        return list(result)
+    
+    async def remove_members(self, key: str, *members: str) -> int:
+        if not members:
+            return 0
+        started = time.perf_counter()
+        result = await self.redis.zrem(key, *members)
+        observe_redis("zrem", started)
+        return result
+    
+    async def decay_scores(self, key: str, factor: float, min_score: float) -> int:
+        started = time.perf_counter()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # A union of the set with itself, weighted, rescales every score in place
+            pipe.zunionstore(key, {key: factor})
+            pipe.zremrangebyscore(key, "-inf", f"({min_score}")
+            _, dropped = await pipe.execute()
+        observe_redis("zdecay", started)
+        return dropped
+    
+    async def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        token = uuid.uuid4().hex
+        started = time.perf_counter()
+        acquired = await self.redis.set(key, token, px=ttl_ms, nx=True)
+        observe_redis("set_nx", started)
+        return token if acquired else None
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        started = time.perf_counter()
+        result = await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+        observe_redis("eval", started)
+        return bool(result)
+    
+    def _encode(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+    
+    def _decode(self, data: Optional[bytes]) -> Optional[Any]:
+        if data:
+            return self.codec.decode(data)
+        return None
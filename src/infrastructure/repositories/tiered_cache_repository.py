@@ -0,0 +1,308 @@
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from src.domain.ports.repositories import CacheCodec, CachePipeline, CacheRepository
+from src.domain.ports.repositories.cache_repository import expiry_for
+from src.infrastructure.cache_codecs import JsonCacheCodec
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    Entries are bounded both by count and by their approximate encoded size.
+    Values are stored the way the remote tier returns them and are shared
+    between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+        self.counters: Dict[str, Dict[str, int]] = {
+            "l1": {"hits": 0, "misses": 0},
+            "l2": {"hits": 0, "misses": 0},
+        }
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value); a negative entry is found with value None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, (None if value is _MISSING else value)
+
+    def store(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        if size > self.max_bytes:
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + (ttl or self.default_ttl), value, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def store_missing(self, key: str):
+        self.store(key, _MISSING, len(key), self.negative_ttl)
+
+    def invalidate(self, key: str):
+        self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def record(self, tier: str, hit: bool):
+        self.counters[tier]["hits" if hit else "misses"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "l1": dict(self.counters["l1"]),
+            "l2": dict(self.counters["l2"]),
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+class TieredCachePipeline(CachePipeline):
+    """Queues on the remote pipeline and remembers which keys L1 must drop."""
+
+    def __init__(self, remote: CachePipeline, local: LocalCache):
+        self.remote = remote
+        self.local = local
+        self.keys: List[str] = []
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        self._touch(key)
+        self.remote.set(key, value, expire)
+
+    def delete(self, *keys: str):
+        self._touch(*keys)
+        self.remote.delete(*keys)
+
+    def increment(self, key: str, amount: int = 1, initial: int = 0, expire: Optional[int] = None):
+        self._touch(key)
+        self.remote.increment(key, amount, initial, expire)
+
+    def expire(self, key: str, seconds: int):
+        # L1 would otherwise keep serving the key past its new remote expiry
+        self._touch(key)
+        self.remote.expire(key, seconds)
+
+    @property
+    def results(self) -> List[Any]:
+        return self.remote.results
+
+    def _touch(self, *keys: str):
+        for key in keys:
+            self.local.invalidate(key)
+        self.keys.extend(keys)
+
+
+class TieredCacheRepository(CacheRepository):
+    """
+    Two-tier cache: a process-local L1 in front of a remote cache repository.
+
+    Every write and delete is announced through ``publish`` so that the L1 of
+    every other worker drops its copy of the key.
+    """
+
+    def __init__(
+        self,
+        remote: CacheRepository,
+        local: LocalCache,
+        publish: Optional[Callable[..., Awaitable[Any]]] = None,
+        codec: Optional[CacheCodec] = None,
+    ):
+        self.remote = remote
+        self.local = local
+        self.publish = publish
+        # Must match the remote tier's codec for L1 to hand out what L2 would
+        self.codec = codec or JsonCacheCodec()
+
+    async def get(self, key: str) -> Optional[Any]:
+        found, value = self.local.lookup(key)
+        self.local.record("l1", found)
+        if found:
+            return value
+
+        value = await self.remote.get(key)
+        self.local.record("l2", value is not None)
+        if value is None:
+            self.local.store_missing(key)
+        else:
+            self.local.store(key, value, self._size_of(value))
+        return value
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        result = await self.remote.set(key, value, expire)
+        if result:
+            local_value, size = self._normalize(value)
+            ttl = min(expire, self.local.default_ttl) if expire else None
+            self.local.store(key, local_value, size, ttl)
+        else:
+            self.local.invalidate(key)
+        await self._announce(key)
+        return result
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        found, value = self.local.lookup(key)
+        self.local.record("l1", found)
+        if found:
+            return value
+
+        value = await self.remote.get_bytes(key)
+        self.local.record("l2", value is not None)
+        if value is None:
+            self.local.store_missing(key)
+        else:
+            self.local.store(key, value, len(value))
+        return value
+
+    async def set_bytes(self, key: str, value: bytes, expire: Optional[int] = None) -> bool:
+        result = await self.remote.set_bytes(key, value, expire)
+        if result:
+            ttl = min(expire, self.local.default_ttl) if expire else None
+            self.local.store(key, value, len(value), ttl)
+        else:
+            self.local.invalidate(key)
+        await self._announce(key)
+        return result
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        values: List[Optional[Any]] = [None] * len(keys)
+        missing = []
+        for position, key in enumerate(keys):
+            found, value = self.local.lookup(key)
+            self.local.record("l1", found)
+            if found:
+                values[position] = value
+            else:
+                missing.append(position)
+
+        if missing:
+            remote_values = await self.remote.get_many([keys[position] for position in missing])
+            for position, value in zip(missing, remote_values):
+                key = keys[position]
+                self.local.record("l2", value is not None)
+                if value is None:
+                    self.local.store_missing(key)
+                else:
+                    self.local.store(key, value, self._size_of(value))
+                values[position] = value
+        return values
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+        jitter: float = 0.0,
+    ) -> bool:
+        result = await self.remote.set_many(items, expire, jitter)
+        for key, value in items.items():
+            if result:
+                local_value, size = self._normalize(value)
+                ttl = expiry_for(key, expire)
+                self.local.store(key, local_value, size, min(ttl, self.local.default_ttl) if ttl else None)
+            else:
+                self.local.invalidate(key)
+        await self._announce(*items.keys())
+        return result
+
+    async def delete(self, key: str) -> bool:
+        self.local.invalidate(key)
+        result = await self.remote.delete(key)
+        await self._announce(key)
+        return result
+
+    async def delete_many(self, keys: List[str]) -> int:
+        for key in keys:
+            self.local.invalidate(key)
+        result = await self.remote.delete_many(keys)
+        await self._announce(*keys)
+        return result
+
+    async def exists(self, key: str) -> bool:
+        found, value = self.local.lookup(key)
+        if found:
+            return value is not None
+        return await self.remote.exists(key)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[CachePipeline]:
+        async with self.remote.pipeline(transaction) as remote_pipe:
+            pipe = TieredCachePipeline(remote_pipe, self.local)
+            yield pipe
+        # Again after the commands ran, in case a read refilled L1 in between
+        for key in pipe.keys:
+            self.local.invalidate(key)
+        await self._announce(*pipe.keys)
+
+    async def increment(self, key: str, amount: int = 1) -> int:
+        value = await self.remote.increment(key, amount)
+        self.local.store(key, value, len(str(value)))
+        await self._announce(key)
+        return value
+
+    async def increment_score(self, key: str, member: str, amount: float = 1.0) -> float:
+        return await self.remote.increment_score(key, member, amount)
+
+    async def top_members(self, key: str, count: int) -> List[str]:
+        return await self.remote.top_members(key, count)
+
+    async def remove_members(self, key: str, *members: str) -> int:
+        return await self.remote.remove_members(key, *members)
+
+    async def decay_scores(self, key: str, factor: float, min_score: float) -> int:
+        return await self.remote.decay_scores(key, factor, min_score)
+
+    async def acquire_lock(self, key: str, ttl_ms: int) -> Optional[str]:
+        # Locks must be visible to every worker, so they always live in the remote tier
+        return await self.remote.acquire_lock(key, ttl_ms)
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        return await self.remote.release_lock(key, token)
+
+    async def _announce(self, *keys: str):
+        if self.publish is not None and keys:
+            try:
+                await self.publish(*keys)
+            except Exception:
+                # Peers fall back to their L1 TTL if the message is lost
+                pass
+
+    def _normalize(self, value: Any) -> Tuple[Any, int]:
+        """Mirror the remote round trip so L1 hands out what L2 would return."""
+        encoded = self.codec.encode(value)
+        return self.codec.decode(encoded), len(encoded)
+
+    def _size_of(self, value: Any) -> int:
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        return len(self.codec.encode(value))
@@ -0,0 +1,71 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Union
+
+from fastapi import Request, Response
+
+from src.domain.models import Product
+from src.infrastructure.config import settings
+
+
+def product_etag(product: Product) -> str:
+    # str() so a product decoded from the cache hashes the same as one read from MySQL
+    source = f"{product.id}:{product.version}:{product.updated_at}"
+    return '"p-' + hashlib.sha1(source.encode()).hexdigest()[:20] + '"'
+
+
+def collection_etag(version: int, query: Dict[str, Any]) -> str:
+    """
+    Weak ETag of one page of a collection version. ``query`` holds the parsed
+    parameters that select the page; anything else in the URL is ignored, so
+    junk or reordered parameters share a tag (and a response cache entry).
+    Weak because the page may be sent gzipped or not.
+    """
+    source = f"{version}:" + "&".join(f"{name}={query[name]}" for name in sorted(query))
+    return 'W/"c-' + hashlib.sha1(source.encode()).hexdigest()[:20] + '"'
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def last_modified(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """updated_at as an aware UTC datetime, whether it came from MySQL or the cache."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def cache_headers(etag: str, modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": settings.PRODUCT_CACHE_CONTROL}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime] = None) -> bool:
+    """RFC 9110 evaluation: If-None-Match (weak comparison) wins over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified <= since
+    return False
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
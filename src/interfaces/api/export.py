@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncGenerator, AsyncIterator, List
+
+from fastapi import Request
+
+from src.domain.models import Product
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = ["id", "name", "description", "price", "stock", "created_at", "updated_at"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _format_datetime(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _product_row(product: Product) -> list:
+    return [
+        product.id,
+        product.name,
+        product.description,
+        product.price,
+        product.stock,
+        _format_datetime(product.created_at),
+        _format_datetime(product.updated_at),
+    ]
+
+
+def encode_ndjson(products: List[Product]) -> bytes:
+    lines = [json.dumps(dict(zip(EXPORT_FIELDS, _product_row(product)))) for product in products]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(products: List[Product]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_product_row(product) for product in products)
+    return buffer.getvalue().encode("utf-8")
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(
+    batches: AsyncGenerator[List[Product], None],
+    export_format: str,
+    request: Request,
+) -> AsyncIterator[bytes]:
+    """Encode product batches chunk by chunk, stopping early if the client goes away."""
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+    rows = 0
+    completed = False
+    started = time.perf_counter()
+
+    try:
+        if export_format == "csv":
+            yield csv_header()
+
+        async for batch in batches:
+            if await request.is_disconnected():
+                break
+            rows += len(batch)
+            yield encode(batch)
+        else:
+            completed = True
+    finally:
+        # Release the server-side cursor right away instead of at session close
+        await batches.aclose()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Product export (%s) %s: %d rows in %.2fs (%.0f rows/s)",
+            export_format,
+            "completed" if completed else "aborted",
+            rows,
+            elapsed,
+            rows / elapsed if elapsed > 0 else 0.0,
+        )
@@ -0,0 +1,102 @@
+import gzip
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from src.domain.ports.repositories import CacheRepository
+from src.interfaces.api.conditional import weak_etag
+from src.interfaces.api.serialization import ProductJSONResponse
+
+# First byte of a cached entry: how the body that follows the header line is encoded
+_IDENTITY = b"j"
+_GZIP = b"z"
+
+
+def product_response_key(product_id: int, generation: int) -> str:
+    # Writes to the product bump its generation, so they need no eviction
+    return f"response:product:{product_id}@{generation}"
+
+
+def collection_response_key(etag: str) -> str:
+    # The collection ETag already covers the version and the query, so writes need no eviction
+    return "response:products:" + etag.removeprefix("W/").strip('"')
+
+
+def accepts_gzip(request: Request) -> bool:
+    qualities = {}
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+    # An explicit gzip entry overrides the wildcard
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    headers: dict
+    gzipped: bool = False
+
+    @property
+    def modified(self) -> Optional[datetime]:
+        value = self.headers.get("Last-Modified")
+        return parsedate_to_datetime(value) if value else None
+
+    def to_response(self, request: Request) -> Response:
+        if not self.gzipped:
+            return ProductJSONResponse(self.body, headers=self.headers)
+        if accepts_gzip(request):
+            return ProductJSONResponse(self.body, headers={**self.headers, "Content-Encoding": "gzip"})
+        return ProductJSONResponse(gzip.decompress(self.body), headers=self.headers)
+
+
+class ResponseCache:
+    """
+    Product GET responses cached as the bytes that go on the wire.
+
+    A hit is answered without building or encoding any model. Bodies of at
+    least ``gzip_min_bytes`` (large lists) are compressed once when stored and
+    kept only in gzip form; the rare client without gzip support gets them
+    decompressed. Their headers are stored with ``Vary: Accept-Encoding`` and
+    a weak ETag, since the two encodings are not byte-identical, so 304s built
+    from them carry the same.
+    """
+
+    def __init__(self, cache: CacheRepository, ttl: int, gzip_min_bytes: int, enabled: bool = True):
+        self.cache = cache
+        self.ttl = ttl
+        self.gzip_min_bytes = gzip_min_bytes
+        self.enabled = enabled
+
+    async def lookup(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        entry = await self.cache.get_bytes(key)
+        if not entry:
+            return None
+        header_line, _, body = entry[1:].partition(b"\n")
+        return CachedResponse(body, json.loads(header_line), entry[:1] == _GZIP)
+
+    async def store(self, key: str, body: bytes, headers: dict) -> CachedResponse:
+        """Cache a freshly encoded 200 response; returns it in the form it was cached."""
+        cached = CachedResponse(body, headers)
+        if len(body) >= self.gzip_min_bytes:
+            headers = {**headers, "ETag": weak_etag(headers["ETag"]), "Vary": "Accept-Encoding"}
+            # mtime=0 keeps the output identical across workers for identical bodies
+            cached = CachedResponse(gzip.compress(body, compresslevel=6, mtime=0), headers, True)
+        if self.enabled:
+            flag = _GZIP if cached.gzipped else _IDENTITY
+            header_line = json.dumps(headers, separators=(",", ":")).encode()
+            await self.cache.set_bytes(key, flag + header_line + b"\n" + cached.body, self.ttl)
+        return cached
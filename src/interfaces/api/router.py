@@ -1,21 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-import bcrypt
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+import base64
+import time
+from dataclasses import replace
 from datetime import timedelta, datetime
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
-from redis import Redis
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.infrastructure.cache import get_redis_dependency
-from src.infrastructure.database import get_db
+from src.infrastructure.cache import get_redis_dependency, build_cache_repository
+from src.infrastructure.database import get_db, get_read_db
+from src.infrastructure.metrics import metrics_recorder
 from src.infrastructure.config import settings
+from src.infrastructure.security import password_hasher, PasswordHasherBusy
 from src.infrastructure.repositories.mysql_product_repository import MySQLProductRepository
 from src.infrastructure.repositories.mysql_user_repository import MySQLUserRepository
 from src.application.services import ProductServiceImpl, UserServiceImpl, CacheServiceImpl
+from src.domain.exceptions import ProductVersionConflict, StockContention
 from src.domain.models import Product, User
+from src.interfaces.api.conditional import (
+    cache_headers, collection_etag, is_not_modified, last_modified, not_modified, product_etag
+)
+from src.interfaces.api.export import MEDIA_TYPES, stream_export
+from src.interfaces.api.response_cache import ResponseCache, collection_response_key, product_response_key
+from src.interfaces.api.serialization import encode_product, encode_products, product_json, product_list_json
 from src.interfaces.api.schemas import (
     ProductCreate, ProductUpdate, ProductResponse,
+    ProductBulkRequest, ProductBulkResult, StockRequest,
     UserCreate, UserUpdate, UserResponse,
     Token, TokenData
 )
@@ -27,14 +40,31 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 
 
 # Dependencies
-async def get_product_service(db: AsyncSession = Depends(get_db), cache: Redis = Depends(get_redis_dependency)):
-    repository = MySQLProductRepository(db)
-    return ProductServiceImpl(repository, cache)
+async def get_product_service(
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: Redis = Depends(get_redis_dependency)
+):
+    repository = MySQLProductRepository(db, read_db)
+    return ProductServiceImpl(repository, build_cache_repository(cache), metrics_recorder)
 
 
-async def get_user_service(db: AsyncSession = Depends(get_db)):
-    repository = MySQLUserRepository(db)
-    return UserServiceImpl(repository)
+async def get_response_cache(cache: Redis = Depends(get_redis_dependency)):
+    return ResponseCache(
+        build_cache_repository(cache),
+        settings.RESPONSE_CACHE_TTL,
+        settings.RESPONSE_CACHE_GZIP_MIN_BYTES,
+        settings.RESPONSE_CACHE_ENABLED,
+    )
+
+
+async def get_user_service(
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: Redis = Depends(get_redis_dependency)
+):
+    repository = MySQLUserRepository(db, read_db)
+    return UserServiceImpl(repository, build_cache_repository(cache))
 
 
 # OAuth2 scheme
@@ -48,12 +78,43 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
-def verify_password(plain_password, hashed_password):
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+def encode_cursor(after_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{after_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded).decode().partition(":")
+        if prefix != "id":
+            raise ValueError(cursor)
+        return int(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
+def parse_ids(ids: str, max_ids: int = 1000) -> List[int]:
+    try:
+        product_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not product_ids or len(product_ids) > max_ids:
+        raise HTTPException(status_code=400, detail=f"ids must contain between 1 and {max_ids} values")
+    return product_ids
 
-def get_password_hash(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+async def verify_password(plain_password, hashed_password):
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Too many authentication requests, try again later")
+
+
+async def get_password_hash(password):
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Too many authentication requests, try again later")
 
 
 async def get_current_user(
@@ -74,7 +135,11 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = await user_service.get_user(user_id=token_data.user_id)
+    # Never cache the principal beyond the lifetime of the token that proved it
+    remaining = int(payload["exp"] - time.time()) if "exp" in payload else 0
+    user = await user_service.get_authenticated_user(
+        token_data.user_id, min(settings.PRINCIPAL_CACHE_TTL, remaining)
+    )
     if user is None:
         raise credentials_exception
     return user
@@ -83,23 +148,118 @@ async def get_current_user(
 # Product Endpoints
 @router.get("/products", response_model=List[ProductResponse], tags=["Products"])
 async def get_products(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated product IDs to fetch in one call"),
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Get a page of products ordered by ID; the next page cursor is returned in X-Next-Cursor.
+    When ids is given, return exactly those products in the requested order instead.
+    Supports If-None-Match: an unchanged collection is answered with 304 without touching MySQL.
+    Encoded pages are cached per collection version; large ones are sent gzipped when accepted.
+    """
+    # Read the version before the data: a write in between makes the ETag older
+    # than the body, which costs a refetch rather than serving stale data
+    version = await product_service.get_collection_version()
+    if ids is not None:
+        product_ids = parse_ids(ids)
+        query = {"ids": product_ids}
+    else:
+        after_id = decode_cursor(after) if after else None
+        query = {"limit": limit, "after": after_id, "min_price": min_price, "max_price": max_price, "in_stock": in_stock}
+    headers = cache_headers(collection_etag(version, query))
+    # Large pages are sent gzipped when accepted, so every representation varies by it
+    headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    
+    cache_key = collection_response_key(headers["ETag"])
+    cached = await response_cache.lookup(cache_key)
+    if cached is not None:
+        return cached.to_response(request)
+    
+    if ids is not None:
+        products = await product_service.get_products(product_ids)
+    else:
+        page = await product_service.get_products_page(limit, after_id, min_price, max_price, in_stock)
+        if page.next_after_id is not None:
+            headers["X-Next-Cursor"] = encode_cursor(page.next_after_id)
+        products = page.items
+    
+    cached = await response_cache.store(cache_key, encode_products(products), headers)
+    return cached.to_response(request)
+
+
+@router.get("/products/search", response_model=List[ProductResponse], tags=["Products"])
+async def search_products(
+    q: Optional[str] = Query(None, max_length=200, description="Words to match in name and description"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    sort: str = Query("relevance", pattern="^(relevance|price_asc|price_desc|newest)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    product_service: ProductServiceImpl = Depends(get_product_service)
+):
+    """
+    Search products by text, ranked by relevance unless another sort is given.
+    The offset of the next page is returned in X-Next-Offset.
+    """
+    page = await product_service.search_products(q, min_price, max_price, in_stock, sort, limit, offset)
+    headers = None
+    if page.next_offset is not None:
+        headers = {"X-Next-Offset": str(page.next_offset)}
+    return product_list_json(page.items, headers)
+
+
+@router.get("/products/export", tags=["Products"])
+async def export_products(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(1000, ge=100, le=10000),
     product_service: ProductServiceImpl = Depends(get_product_service)
 ):
-    """Get all products"""
-    products = await product_service.get_all_products()
-    return products
+    """Stream the whole product catalogue as NDJSON or CSV"""
+    batches = product_service.export_products(batch_size)
+    return StreamingResponse(
+        stream_export(batches, format, request),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
 
 
 @router.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
 async def get_product(
     product_id: int,
-    product_service: ProductServiceImpl = Depends(get_product_service)
+    request: Request,
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    response_cache: ResponseCache = Depends(get_response_cache)
 ):
-    """Get a product by ID"""
+    """Get a product by ID; honours If-None-Match and If-Modified-Since"""
+    cache_key = product_response_key(product_id, await product_service.get_product_generation(product_id))
+    cached = await response_cache.lookup(cache_key)
+    if cached is not None:
+        await product_service.record_view(product_id)
+        if is_not_modified(request, cached.headers["ETag"], cached.modified):
+            return not_modified(cached.headers)
+        return cached.to_response(request)
+    
     product = await product_service.get_product(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    
+    modified = last_modified(product.updated_at)
+    headers = cache_headers(product_etag(product), modified)
+    if is_not_modified(request, headers["ETag"], modified):
+        return not_modified(headers)
+    cached = await response_cache.store(cache_key, encode_product(product), headers)
+    return cached.to_response(request)
 
 
 @router.post("/products", response_model=ProductResponse, status_code=201, tags=["Products"])
@@ -117,11 +277,31 @@ async def create_product(
             stock=product_data.stock
         )
         created_product = await product_service.create_product(product)
-        return created_product
+        return product_json(created_product, status_code=201)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/products/bulk", response_model=List[ProductBulkResult], tags=["Products"])
+async def bulk_upsert_products(
+    bulk_data: ProductBulkRequest,
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Create or update up to 1000 products in one transaction (requires authentication)"""
+    products = [
+        Product(
+            id=item.id,
+            name=item.name,
+            description=item.description,
+            price=item.price,
+            stock=item.stock
+        )
+        for item in bulk_data.items
+    ]
+    return await product_service.bulk_upsert_products(products)
+
+
 @router.put("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
 async def update_product(
     product_id: int,
@@ -134,21 +314,95 @@ async def update_product(
     if not existing_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    # Update only the provided fields
-    if product_data.name is not None:
-        existing_product.name = product_data.name
-    if product_data.description is not None:
-        existing_product.description = product_data.description
-    if product_data.price is not None:
-        existing_product.price = product_data.price
-    if product_data.stock is not None:
-        existing_product.stock = product_data.stock
+    # Update only the provided fields, on a new object: the one read may be shared with other requests
+    changes = {
+        field: value
+        for field, value in product_data.model_dump(exclude={"version"}).items()
+        if value is not None
+    }
+    # The cached copy's version may be stale; without an explicit one the service uses the stored version
+    product = replace(existing_product, **changes, version=product_data.version)
+    
+    try:
+        updated_product = await product_service.update_product(product_id, product)
+        return product_json(updated_product)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProductVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.patch("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
+async def patch_product(
+    product_id: int,
+    product_data: ProductUpdate,
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Change only the given fields of a product (requires authentication).
+
+    The change is one conditional UPDATE, with no read before it. Returning
+    the full product costs a second statement (a primary-key SELECT), plus
+    the cache-invalidation round trips every write makes.
+    """
+    changes = product_data.model_dump(exclude_unset=True)
+    expected_version = changes.pop("version", None)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No fields to update")
     
     try:
-        updated_product = await product_service.update_product(product_id, existing_product)
-        return updated_product
+        product = await product_service.patch_product(product_id, changes, expected_version)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ProductVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product_json(product)
+
+
+def stock_quantities(stock_data: StockRequest) -> Dict[int, int]:
+    quantities: Dict[int, int] = {}
+    for item in stock_data.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return quantities
+
+
+@router.post("/products/stock/reserve", status_code=204, tags=["Products"])
+async def reserve_stock(
+    stock_data: StockRequest,
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Atomically take stock for every item, or for none of them (requires authentication)"""
+    try:
+        failed_ids = await product_service.reserve_stock(stock_quantities(stock_data))
+    except StockContention:
+        raise HTTPException(status_code=503, detail="Stock is busy, try again", headers={"Retry-After": "1"})
+    if failed_ids:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Insufficient stock", "product_ids": failed_ids},
+        )
+
+
+@router.post("/products/stock/release", status_code=204, tags=["Products"])
+async def release_stock(
+    stock_data: StockRequest,
+    product_service: ProductServiceImpl = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Return previously reserved stock for every item, or for none of them (requires authentication)"""
+    try:
+        failed_ids = await product_service.release_stock(stock_quantities(stock_data))
+    except StockContention:
+        raise HTTPException(status_code=503, detail="Stock is busy, try again", headers={"Retry-After": "1"})
+    if failed_ids:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Product not found", "product_ids": failed_ids},
+        )
 
 
 @router.delete("/products/{product_id}", status_code=204, tags=["Products"])
@@ -171,7 +425,7 @@ async def create_user(
 ):
     """Register a new user"""
     try:
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
         user = User(
             username=user_data.username,
             email=user_data.email,
@@ -197,13 +451,18 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade the stored hash while we still have the plain password
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash(form_data.password)
+        await user_service.update_user(user.id, user)
+    
     access_token = create_access_token(
         data={"sub": str(user.id)}
     )
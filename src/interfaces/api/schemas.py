@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -18,15 +18,42 @@ class ProductUpdate(ProductBase):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     price: Optional[float] = Field(None, gt=0)
     stock: Optional[int] = Field(None, ge=0)
+    version: Optional[int] = Field(None, ge=1, description="Only apply the update if the product is still at this version")
 
 
 class ProductResponse(ProductBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBulkItem(ProductBase):
+    id: Optional[int] = Field(None, gt=0)
+
+
+class ProductBulkRequest(BaseModel):
+    items: List[ProductBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
+class ProductBulkResult(BaseModel):
+    index: int
+    status: str
+    product: Optional[ProductResponse] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockItem(BaseModel):
+    product_id: int = Field(..., gt=0)
+    quantity: int = Field(..., gt=0)
+
+
+class StockRequest(BaseModel):
+    items: List[StockItem] = Field(..., min_length=1, max_length=100)
 
 
 class UserBase(BaseModel):
@@ -49,8 +76,7 @@ class UserResponse(UserBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
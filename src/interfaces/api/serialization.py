@@ -0,0 +1,32 @@
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.domain.models import Product
+
+# Serializers are compiled once from the domain dataclass. Dumping skips the
+# validation pass FastAPI would otherwise run against ProductResponse; routes
+# keep their response_model, so the OpenAPI schema is unchanged.
+_product_serializer = TypeAdapter(Product)
+_product_list_serializer = TypeAdapter(List[Product])
+
+
+class ProductJSONResponse(Response):
+    media_type = "application/json"
+
+
+def encode_product(product: Product) -> bytes:
+    return _product_serializer.dump_json(product)
+
+
+def encode_products(products: List[Product]) -> bytes:
+    return _product_list_serializer.dump_json(products)
+
+
+def product_json(product: Product, status_code: int = 200, headers: Optional[dict] = None) -> ProductJSONResponse:
+    return ProductJSONResponse(encode_product(product), status_code=status_code, headers=headers)
+
+
+def product_list_json(products: List[Product], headers: Optional[dict] = None) -> ProductJSONResponse:
+    return ProductJSONResponse(encode_products(products), headers=headers)
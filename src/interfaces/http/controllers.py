@@ -1,6 +1,11 @@
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from src.infrastructure.cache import get_redis_pool_stats, get_cache_stats
+from src.infrastructure.database import get_db_pool_stats
+from src.infrastructure.metrics import render_metrics, stock_contention
+from src.infrastructure.security import password_hasher
 from src.interfaces.api.router import router as api_router
+from src.interfaces.http.warmup import warmup
 
 
 controller_router = APIRouter()
@@ -12,4 +17,39 @@ controller_router.include_router(api_router, prefix="/api")
 @controller_router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return JSONResponse(content={"status": "ok"})
\ No newline at end of file
+    return JSONResponse(content={"status": "ok"})
+
+
+@controller_router.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until this worker has finished warming up"""
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.stats())
+
+
+@controller_router.get("/health/pools")
+async def pool_stats():
+    """Connection pool statistics for monitoring"""
+    return JSONResponse(content={
+        "database": get_db_pool_stats(),
+        "redis": get_redis_pool_stats(),
+        "password_hasher": password_hasher.stats(),
+    })
+
+
+@controller_router.get("/health/cache")
+async def cache_stats():
+    """Hit/miss counters for the L1 (in-process) and L2 (Redis) cache tiers"""
+    return JSONResponse(content=get_cache_stats())
+
+
+@controller_router.get("/health/stock")
+async def stock_stats():
+    """Products with the most stock reservation conflicts in this worker"""
+    return JSONResponse(content={"hottest": stock_contention.hottest()})
+
+
+@controller_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in text exposition format"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
\ No newline at end of file
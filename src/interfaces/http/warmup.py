@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from src.application.services import ProductServiceImpl
+from src.infrastructure.cache import build_cache_repository, get_redis_client, warm_up_redis
+from src.infrastructure.config import settings
+from src.infrastructure.database import async_session_factory, warm_up_db
+from src.infrastructure.metrics import metrics_recorder
+from src.infrastructure.repositories import MySQLProductRepository
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Background warm-up run once per worker after startup; /ready reports it.
+
+    Opening connections is retried until it succeeds, since a worker that cannot
+    reach MySQL or Redis should not receive traffic. Preloading hot products is
+    best effort: a cold cache is slower, not broken.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.db_connections = 0
+        self.redis_connections = 0
+        self.products_preloaded = 0
+        self.duration_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "db_connections": self.db_connections,
+            "redis_connections": self.redis_connections,
+            "products_preloaded": self.products_preloaded,
+            "duration_seconds": self.duration_seconds,
+            "last_error": self.last_error,
+        }
+
+    async def _run(self):
+        started = time.monotonic()
+        while True:
+            self.attempts += 1
+            try:
+                self.db_connections = await warm_up_db(settings.WARMUP_DB_CONNECTIONS)
+                self.redis_connections = await warm_up_redis(settings.WARMUP_REDIS_CONNECTIONS)
+                break
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("Warm-up attempt %d failed: %s", self.attempts, e)
+                await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+
+        try:
+            self.products_preloaded = await self._preload_products(settings.WARMUP_HOT_PRODUCTS)
+        except Exception as e:
+            logger.warning("Hot product preload failed: %s", e)
+
+        self.duration_seconds = round(time.monotonic() - started, 3)
+        self.ready = True
+        logger.info(
+            "Warm-up finished in %.2fs: %d DB and %d Redis connections, %d products cached",
+            self.duration_seconds,
+            self.db_connections,
+            self.redis_connections,
+            self.products_preloaded,
+        )
+
+    @staticmethod
+    async def _preload_products(count: int) -> int:
+        if count <= 0:
+            return 0
+        async with async_session_factory() as session:
+            service = ProductServiceImpl(
+                MySQLProductRepository(session),
+                build_cache_repository(await get_redis_client()),
+                metrics_recorder,
+            )
+            return await service.warm_cache(count)
+
+
+warmup = Warmup()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+from typing import Optional
+
+import httpx
+
+from benchmarks.api_benchmark import app, setup
+from benchmarks.stand_ins import InMemoryCacheRepository
+from src.domain.ports.repositories import CacheCodec
+from src.infrastructure.cache_codecs import JsonCacheCodec
+from src.infrastructure.repositories.tiered_cache_repository import LocalCache, TieredCacheRepository
+
+
+class ApiTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    ``main.app`` on SQLite with an in-memory remote cache behind its own L1,
+    as in benchmarks/api_benchmark.py. ``self.auth`` authenticates a user.
+    """
+
+    product_count = 5
+    codec: Optional[CacheCodec] = None
+
+    async def asyncSetUp(self):
+        codec = self.codec or JsonCacheCodec()
+        self.remote = InMemoryCacheRepository(codec)
+        self.local = LocalCache(max_entries=1000, max_bytes=1 << 20, default_ttl=30, negative_ttl=5)
+        self.cache = TieredCacheRepository(self.remote, self.local, codec=codec)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        engine = await setup(os.path.join(directory.name, "test.sqlite"), self.product_count, self.cache)
+        self.addAsyncCleanup(engine.dispose)
+        self.addCleanup(app.dependency_overrides.clear)
+
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        self.addAsyncCleanup(self.client.aclose)
+
+        user = {"username": "tester", "email": "tester@example.com", "password": "secret1"}
+        await self.client.post("/api/users", json=user)
+        login = await self.client.post("/api/login", data={"username": user["email"], "password": user["password"]})
+        self.auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
@@ -0,0 +1,101 @@
+import unittest
+from datetime import datetime, timezone
+
+from src.application.cached_records import product_from_cache, user_from_cache
+from src.domain.models import Product, User
+from src.infrastructure.cache_codecs import BinaryCacheCodec, JsonCacheCodec
+
+
+def make_product(index: int = 1) -> Product:
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return Product(
+        id=index,
+        name=f"Product {index}",
+        description="Description",
+        price=9.5,
+        stock=3,
+        created_at=now,
+        updated_at=now,
+        version=2,
+    )
+
+
+class BinaryCacheCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.codec = BinaryCacheCodec(compress_min_bytes=1024)
+
+    def round_trip(self, value):
+        return self.codec.decode(self.codec.encode(value))
+
+    def test_round_trips_plain_values(self):
+        for value in (None, True, False, 0, -7, 2 ** 70, 1.5, "", "text é", b"\x00\xff", [1, "a"], {"k": [None, 2.0]}):
+            with self.subTest(value=value):
+                self.assertEqual(self.round_trip(value), value)
+
+    def test_round_trips_datetimes(self):
+        naive = datetime(2024, 2, 29, 23, 59, 59, 999999)
+        aware = datetime(2024, 2, 29, 23, 59, 59, tzinfo=timezone.utc)
+        self.assertEqual(self.round_trip(naive), naive)
+        self.assertEqual(self.round_trip(aware), aware)
+        self.assertIsNone(self.round_trip(naive).tzinfo)
+
+    def test_round_trips_records(self):
+        user = User(id=1, username="alice", email="a@example.com", created_at=datetime(2024, 1, 1))
+        entry = {"v": make_product(), "e": 1700000000.5, "d": 0.002}
+        self.assertEqual(self.round_trip(user), user)
+        self.assertEqual(self.round_trip(entry), entry)
+
+    def test_compresses_large_payloads(self):
+        products = [make_product(index) for index in range(200)]
+        encoded = self.codec.encode(products)
+        self.assertTrue(encoded[1] & 0x01)
+        self.assertEqual(self.codec.decode(encoded), products)
+
+    def test_record_with_other_fields_is_a_miss(self):
+        encoded = bytearray(self.codec.encode(make_product()))
+        # The field-name hash follows the record tag
+        position = encoded.index(b"P") + 1
+        encoded[position] ^= 0xFF
+        self.assertIsNone(self.codec.decode(bytes(encoded)))
+
+    def test_corrupt_or_foreign_entries_are_misses(self):
+        encoded = self.codec.encode({"items": [make_product()]})
+        self.assertIsNone(self.codec.decode(encoded[:-3]))
+        self.assertIsNone(self.codec.decode(encoded + b"N"))
+        self.assertIsNone(self.codec.decode(b"\x02" + encoded[1:]))
+        self.assertIsNone(self.codec.decode(b""))
+
+    def test_reads_json_entries(self):
+        self.assertEqual(self.codec.decode(b'{"id": 1}'), {"id": 1})
+        self.assertEqual(self.codec.decode(b"42"), 42)
+        self.assertIsNone(self.codec.decode(b"not json"))
+
+
+class JsonCacheCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.codec = JsonCacheCodec()
+
+    def test_products_round_trip_through_their_fields(self):
+        product = make_product()
+        self.assertEqual(product_from_cache(self.codec.decode(self.codec.encode(product))), product)
+
+    def test_users_round_trip_through_their_fields(self):
+        user = User(id=1, username="alice", created_at=datetime(2024, 1, 1, 8, 30), updated_at=None)
+        self.assertEqual(user_from_cache(self.codec.decode(self.codec.encode(user))), user)
+
+    def test_datetimes_are_iso_8601(self):
+        encoded = self.codec.encode({"at": datetime(2024, 1, 1, 12, 0)})
+        self.assertEqual(encoded, b'{"at": "2024-01-01T12:00:00"}')
+
+    def test_strings_round_trip(self):
+        self.assertEqual(self.codec.decode(self.codec.encode("plain text")), "plain text")
+
+    def test_binary_and_invalid_entries_are_misses(self):
+        binary = BinaryCacheCodec().encode(make_product())
+        self.assertIsNone(self.codec.decode(binary))
+        self.assertIsNone(self.codec.decode(b"\xff\xfe not json"))
+        self.assertIsNone(self.codec.decode(b""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from benchmarks.stand_ins import InMemoryCacheRepository
+from src.application.cache_generations import CacheGenerations
+
+
+class CacheGenerationsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = InMemoryCacheRepository()
+        self.generations = CacheGenerations(self.cache, ttl=600)
+        clock = mock.patch("src.application.cache_generations.time.time", return_value=1000.0)
+        self.now = clock.start()
+        self.addCleanup(clock.stop)
+
+    async def bump(self, *tags: str):
+        async with self.cache.pipeline() as pipe:
+            self.generations.bump(pipe, *tags)
+
+    async def test_missing_counters_start_from_the_clock(self):
+        self.assertEqual(await self.generations.current(["products", "product:5"]), [1_000_000, 1_000_000])
+        await self.bump("product:5")
+        self.assertEqual(await self.generations.current(["products", "product:5"]), [1_000_000, 1_000_001])
+
+    async def test_write_after_eviction_never_reuses_a_generation(self):
+        await self.bump("product:5")
+        await self.bump("product:5")
+        (cached_with,) = await self.generations.current(["product:5"])
+        await self.cache.set(CacheGenerations.key("product:5", cached_with), "old row")
+
+        # The counter is evicted, then the product is written before any read seeds it again
+        await self.cache.delete("gen:product:5")
+        self.now.return_value = 1000.5
+        await self.bump("product:5")
+
+        (generation,) = await self.generations.current(["product:5"])
+        self.assertGreater(generation, cached_with)
+        self.assertIsNone(await self.cache.get(CacheGenerations.key("product:5", generation)))
+
+    async def test_bump_refreshes_the_counter_ttl(self):
+        await self.bump("products")
+        expires_at, _ = self.cache._data["gen:products"]
+        self.assertIsNotNone(expires_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
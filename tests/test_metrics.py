@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infrastructure.metrics import instrument_statements
+
+
+class StatementTimingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_statements_do_not_leave_start_times_behind(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        engine = instrument_statements(
+            create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory.name, 'test.sqlite')}"), "test"
+        )
+        self.addAsyncCleanup(engine.dispose)
+
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with self.assertRaises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            started = await conn.run_sync(lambda sync_conn: dict(sync_conn.info.get("query_started", {})))
+        self.assertEqual(started, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from benchmarks.api_benchmark import app
+from src.infrastructure.cache_codecs import BinaryCacheCodec
+from src.interfaces.api import router as api
+from src.interfaces.api.response_cache import ResponseCache
+from tests.support import ApiTestCase
+
+
+class RejectedUpdateTest(ApiTestCase):
+    # The binary codec hands cached Product objects to the L1 tier as they are
+    codec = BinaryCacheCodec()
+
+    async def test_rejected_put_does_not_leak_into_cached_reads(self):
+        original = (await self.client.get("/api/products/1")).json()
+
+        response = await self.client.put(
+            "/api/products/1",
+            json={"name": "NEVER SAVED", "price": 999.0, "version": original["version"] + 1},
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 409)
+
+        listed = (await self.client.get("/api/products", params={"ids": "1"})).json()
+        self.assertEqual((listed[0]["name"], listed[0]["price"]), (original["name"], original["price"]))
+        again = (await self.client.get("/api/products/1")).json()
+        self.assertEqual(again, original)
+
+
+class BulkUpsertTest(ApiTestCase):
+    async def test_returned_ids_are_the_stored_rows(self):
+        items = [{"name": name, "description": "", "price": 5.0, "stock": 1} for name in ("A", "B", "C")]
+        response = await self.client.post("/api/products/bulk", json={"items": items}, headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([result["status"] for result in results], ["created"] * 3)
+
+        for item, result in zip(items, results):
+            stored = await self.client.get(f"/api/products/{result['product']['id']}")
+            self.assertEqual(stored.status_code, 200)
+            self.assertEqual(stored.json()["name"], item["name"])
+
+
+class CollectionResponseCacheTest(ApiTestCase):
+    product_count = 60
+
+    def response_keys(self):
+        return [key for key in self.remote._data if key.startswith("response:products:")]
+
+    async def test_unrecognised_and_reordered_parameters_share_one_entry(self):
+        first = await self.client.get("/api/products", params={"limit": 5, "min_price": 1})
+        await self.client.get("/api/products", params={"min_price": "1.0", "limit": 5, "junk": "x"})
+        await self.client.get("/api/products", params={"limit": 5, "min_price": 1, "other": "y"})
+        self.assertEqual(len(self.response_keys()), 1)
+        self.assertTrue(first.headers["etag"].startswith('W/"'))
+
+    async def test_gzipped_page_and_its_304_vary_by_encoding(self):
+        response = await self.client.get("/api/products", params={"limit": 50})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+
+        revalidated = await self.client.get(
+            "/api/products", params={"limit": 50}, headers={"If-None-Match": response.headers["etag"]}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["vary"], "Accept-Encoding")
+
+
+class ProductResponseCacheTest(ApiTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        # Single products stay below the default threshold
+        response_cache = ResponseCache(self.cache, ttl=300, gzip_min_bytes=64)
+        app.dependency_overrides[api.get_response_cache] = lambda: response_cache
+
+    async def test_304_from_a_gzipped_cached_product_varies_by_encoding(self):
+        path = "/api/products/1"
+        first = await self.client.get(path)
+        cached = await self.client.get(path)
+        self.assertEqual(cached.headers["content-encoding"], "gzip")
+        self.assertTrue(cached.headers["etag"].startswith('W/"'))
+
+        revalidated = await self.client.get(path, headers={"If-None-Match": cached.headers["etag"]})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["vary"], "Accept-Encoding")
+        self.assertEqual(revalidated.headers["etag"], cached.headers["etag"])
+        self.assertEqual(first.json(), cached.json())
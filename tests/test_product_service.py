@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from benchmarks.stand_ins import InMemoryCacheRepository
+from src.application.services import ProductServiceImpl
+from src.domain.models import Product
+
+
+class CoalescedLoadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_each_coalesced_caller_gets_its_own_product(self):
+        async def get_by_id(product_id):
+            await asyncio.sleep(0.01)
+            return Product(id=product_id, name="Lamp", price=10.0, stock=1, version=1)
+
+        repository = mock.Mock(get_by_id=mock.AsyncMock(side_effect=get_by_id))
+        service = ProductServiceImpl(repository, InMemoryCacheRepository())
+
+        first, second = await asyncio.gather(service.get_product(1), service.get_product(1))
+        self.assertEqual(repository.get_by_id.await_count, 1)
+        self.assertIsNot(first, second)
+        first.name = "Changed"
+        self.assertEqual(second.name, "Lamp")
+
+
+
+class PopularityTest(unittest.IsolatedAsyncioTestCase):
+    async def test_only_found_products_are_ranked(self):
+        async def get_by_id(product_id):
+            return Product(id=product_id, name="Lamp", price=10.0, stock=1, version=1) if product_id == 1 else None
+
+        repository = mock.Mock(get_by_id=mock.AsyncMock(side_effect=get_by_id))
+        service = ProductServiceImpl(repository, InMemoryCacheRepository())
+        service.popularity_sample_rate = 1.0
+
+        self.assertIsNone(await service.get_product(404))
+        await service.get_product(1)
+        await service.get_product(1)
+        self.assertEqual(await service.cache.top_members(service.popularity_key, 10), ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+
+from benchmarks.stand_ins import InMemoryCacheRepository
+from src.application.services import UserServiceImpl
+from src.domain.models import User
+
+
+class PrincipalInvalidationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_principal_is_evicted_again_after_commit(self):
+        committed = []
+        repository = mock.Mock(
+            delete=mock.AsyncMock(return_value=True),
+            on_commit=mock.Mock(side_effect=committed.append),
+        )
+        cache = InMemoryCacheRepository()
+        service = UserServiceImpl(repository, cache)
+
+        await cache.set("user:7", User(id=7, username="old"), 300)
+        self.assertTrue(await service.delete_user(7))
+        self.assertIsNone(await cache.get("user:7"))
+
+        # A request between the delete and the commit reloads the old row
+        await cache.set("user:7", User(id=7, username="old"), 300)
+        for callback in committed:
+            await callback()
+        self.assertIsNone(await cache.get("user:7"))
+
+
+if __name__ == "__main__":
+    unittest.main()